@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Batch Resume Generation
+Tailor a whole directory, glob or JSONL manifest of job descriptions in one process
+"""
+
+import os
+import sys
+import json
+import glob
+import argparse
+
+import instrumentation
+from generate_resume import (
+    tailor, render_latex, load_template, log_application
+)
+from compile_pool import CompilePool, DEFAULT_TIMEOUT
+from pdf_cache import PdfCache
+from latex_format import FormatCache
+
+MASTER_PATH = 'data/master_content.json'
+TEMPLATE_PATH = 'templates/resume_template.tex'
+SCORE_CHUNK = 256
+MANIFEST_EXTENSIONS = ('.jsonl', '.jsonl.gz', '.jsonl.zst', '.jsonl.zstd')
+
+def slugify(text):
+    """Turn a company/title string into a safe output name"""
+    slug = ''.join(c if c.isalnum() else '_' for c in text.lower())
+    return '_'.join(part for part in slug.split('_') if part)
+
+def iter_job_files(paths):
+    """Yield (output_name, job_data, error) for a list of job JSON files"""
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, 'r') as f:
+                yield name, json.load(f), None
+        except (OSError, ValueError) as e:
+            yield name, None, f"could not load {path}: {e}"
+
+def iter_manifest(manifest_path):
+    """Yield (output_name, job_data, error) for each line of a JSONL manifest
+
+    A line is either a full job description (optionally with an
+    "output_name" key) or a reference of the form
+    {"job_file": "...", "output_name": "..."}. Without an output_name a
+    description is named after its company and title; a name already
+    used by an earlier line gets that line's number appended, so reposts
+    never overwrite each other's output.
+    """
+    from ingest_jobs import open_feed
+
+    seen = set()
+
+    def unique(name, line_no):
+        if name in seen:
+            name = f"{name}_{line_no}"
+        seen.add(name)
+        return name
+
+    with open_feed(manifest_path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                yield f"line_{line_no}", None, f"invalid JSON on line {line_no}: {e}"
+                continue
+            if not isinstance(entry, dict):
+                yield f"line_{line_no}", None, f"line {line_no} is not a JSON object"
+                continue
+
+            if 'job_file' in entry:
+                if not isinstance(entry['job_file'], str):
+                    yield f"line_{line_no}", None, f"line {line_no}: 'job_file' must be a string"
+                    continue
+                for name, job_data, error in iter_job_files([entry['job_file']]):
+                    yield unique(entry.get('output_name', name), line_no), job_data, error
+                continue
+
+            name = entry.pop('output_name', None)
+            if not name:
+                name = slugify(f"{entry.get('company', '')}_{entry.get('title', '')}") or f"line_{line_no}"
+            yield unique(name, line_no), entry, None
+
+def iter_jobs(source):
+    """Resolve a directory, glob pattern or JSONL manifest into a job stream"""
+    if os.path.isdir(source):
+        return iter_job_files(sorted(glob.glob(os.path.join(source, '*.json'))))
+    if source.endswith(MANIFEST_EXTENSIONS):
+        return iter_manifest(source)
+    return iter_job_files(sorted(glob.glob(source)))
+
+def iter_chunks(items, size):
+    """Group an iterable into lists of at most size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_tailored(jobs, profile, engine=None):
+    """Yield (name, job_data, tailored, error) for every job in a job stream
+
+    With a RelevanceEngine, jobs are scored SCORE_CHUNK at a time in one
+    matrix product each; otherwise by keyword overlap.
+    """
+    for chunk in iter_chunks(jobs, SCORE_CHUNK):
+        scored = None
+        if engine is not None:
+            with instrumentation.stage('tfidf', jobs=len(chunk)):
+                scored = iter(engine.score_jobs([job for _, job, error in chunk if error is None]))
+
+        for name, job_data, error in chunk:
+            tailored = None
+            if error is None:
+                relevance = next(scored) if scored is not None else None
+                try:
+                    tailored = tailor(profile, job_data, relevance)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            yield name, job_data, tailored, error
+
+def _claim(claimed, output_path):
+    """Record output_path as taken; return an error if an earlier job already has it"""
+    if output_path in claimed:
+        return f"duplicate output name: {output_path} is already written by an earlier job"
+    claimed.add(output_path)
+    return None
+
+def run_batch(jobs, profile, template_path, output_dir='output', log=True,
+              workers=None, timeout=DEFAULT_TIMEOUT, cache=None, engine=None, formats=None,
+              layout=None):
+    """Tailor and render every job, returning a list of per-job results
+
+    Tailoring and rendering happen in this process; the pdflatex compiles
+    are handed to a bounded CompilePool so several run at once. With a
+    layout_budget.Layout, each selection is trimmed to one predicted page
+    first and resumes that still compile to more pages get a warning. A
+    job whose output path an earlier job already claimed fails rather
+    than overwriting it.
+    """
+    if layout is not None:
+        from layout_budget import fit
+    template = load_template(template_path)
+    pending, claimed = [], set()
+
+    with CompilePool(workers, timeout, cache=cache, template_path=template_path,
+                     formats=formats) as pool:
+        for name, job_data, tailored, error in iter_tailored(jobs, profile, engine):
+            output_path = os.path.join(output_dir, f'{name}.pdf')
+            future = None
+            error = error or _claim(claimed, output_path)
+            if error is None:
+                try:
+                    if layout is not None:
+                        tailored, _ = fit(tailored, layout)
+                    with instrumentation.stage('render', job=name):
+                        latex_content = render_latex(tailored.context(), template)
+                    future = pool.submit(name, latex_content, output_path)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            pending.append((name, output_path, job_data, future, error))
+
+    results = []
+    for name, output_path, job_data, future, error in pending:
+        result = {'name': name, 'output': output_path, 'error': error}
+        if future is not None:
+            compiled = future.result()
+            result['error'] = compiled.error
+            if layout is not None and (compiled.pages or 1) > 1:
+                result['warning'] = f"{compiled.pages} pages despite the one-page layout budget"
+            if compiled.error is None and log:
+                with instrumentation.stage('log_application'):
+                    log_application(job_data, output_path)
+        results.append(result)
+
+    return results
+
+def run_preview_batch(jobs, profile, output_format, output_dir='output', engine=None):
+    """Write a JSON/Markdown/HTML preview per job; no LaTeX and nothing is logged"""
+    from preview import EXTENSIONS, write_preview
+
+    os.makedirs(output_dir, exist_ok=True)
+    extension = EXTENSIONS[output_format]
+    results, claimed = [], set()
+    for name, job_data, tailored, error in iter_tailored(jobs, profile, engine):
+        output_path = os.path.join(output_dir, f'{name}{extension}')
+        error = error or _claim(claimed, output_path)
+        if error is None:
+            try:
+                write_preview(tailored, job_data, output_format, output_path)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        results.append({'name': name, 'output': output_path, 'error': error})
+    return results
+
+def print_report(results):
+    """Print a per-job success/failure report"""
+    failed = [r for r in results if r['error']]
+    skipped = [r for r in results if r.get('skipped')]
+    attempted = len(results) - len(skipped)
+
+    print(f"\n📦 Batch Report: {attempted - len(failed)}/{attempted} succeeded"
+          + (f", {len(skipped)} duplicates skipped" if skipped else ''))
+    for r in results:
+        if r.get('skipped'):
+            print(f"  ⏭️  {r['name']}: {r['skipped']}")
+        elif r['error']:
+            print(f"  ❌ {r['name']}: {r['error']}")
+        elif r.get('warning'):
+            print(f"  ⚠️  {r['name']}: {r['output']} ({r['warning']})")
+        else:
+            print(f"  ✅ {r['name']}: {r['output']}")
+
+def run(args, profile):
+    """Run the batch described by the command line; return (results, skipped)"""
+    engine = None
+    if args.tfidf:
+        from relevance_engine import RelevanceEngine
+        engine = RelevanceEngine.load(MASTER_PATH)
+    jobs, skipped = iter_jobs(args.source), []
+    if args.dedupe:
+        from dedupe import application_deduplicator, filter_jobs, DEFAULT_KNOWN_DAYS
+        days = DEFAULT_KNOWN_DAYS if args.dedupe_days is None else args.dedupe_days
+        jobs = filter_jobs(jobs, application_deduplicator(days=days), skipped)
+
+    if args.format != 'pdf':
+        results = run_preview_batch(jobs, profile, args.format,
+                                    output_dir=args.output_dir, engine=engine)
+    else:
+        from layout_budget import Layout
+        results = run_batch(jobs, profile, TEMPLATE_PATH,
+                            output_dir=args.output_dir, log=not args.no_log,
+                            workers=args.workers, timeout=args.timeout,
+                            cache=None if args.no_cache else PdfCache(), engine=engine,
+                            formats=FormatCache() if args.fmt else None,
+                            layout=Layout.load(TEMPLATE_PATH) if args.one_page else None)
+    return results, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch Resume Generation')
+    parser.add_argument('source', help='Directory of job JSON files, glob pattern, or JSONL manifest')
+    parser.add_argument('--output-dir', default='output', help='Directory for generated PDFs or previews')
+    parser.add_argument('--no-log', action='store_true', help='Do not log applications to the tracker')
+    parser.add_argument('--workers', type=int, help='Concurrent pdflatex compiles (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Per-job pdflatex timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Always recompile, bypassing the PDF cache')
+    parser.add_argument('--tfidf', action='store_true', help='Rank content by TF-IDF similarity instead of keyword overlap')
+    parser.add_argument('--fmt', action='store_true', help='Compile against a cached preamble format (needs mylatexformat)')
+    parser.add_argument('--format', choices=['pdf', 'json', 'markdown', 'html'], default='pdf',
+                        help='Output format; json/markdown/html preview the selection without pdflatex')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Skip near-duplicate postings and roles already in the tracker')
+    parser.add_argument('--dedupe-days', type=int,
+                        help='With --dedupe, skip roles applied for within this many days (default: 180, 0: ever)')
+    parser.add_argument('--one-page', action='store_true',
+                        help='Keep only the highest-scoring content predicted to fit on one page')
+    instrumentation.add_arguments(parser)
+
+    args = parser.parse_args()
+
+    for path in (MASTER_PATH, TEMPLATE_PATH):
+        if not os.path.exists(path):
+            print(f"Error: '{path}' not found")
+            sys.exit(1)
+    if not os.path.exists(args.source) and not glob.has_magic(args.source):
+        print(f"Error: '{args.source}' not found")
+        sys.exit(1)
+
+    from master_profile import MasterProfile
+    profile = MasterProfile.load(MASTER_PATH)
+
+    recorder = instrumentation.setup(args)
+    try:
+        if args.cprofile is not None:
+            with instrumentation.profiled(args.cprofile or None):
+                results, skipped = run(args, profile)
+        else:
+            results, skipped = run(args, profile)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if recorder is not None:
+            recorder.close()
+    print_report(results + skipped)
+    if recorder is not None and args.profile:
+        recorder.print_summary()
+
+    if any(r['error'] for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Compile Benchmark
+Compare per-resume pdflatex latency with and without a preloaded preamble format
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+from generate_resume import tailor_content, load_data, load_template, render_latex
+from compile_pool import compile_latex
+from latex_format import FormatCache
+
+MASTER_PATH = 'data/master_content.json'
+TEMPLATE_PATH = 'templates/resume_template.tex'
+DEFAULT_JOB = 'data/job_descriptions/example_job.json'
+
+def time_compiles(latex_content, work_dir, runs, formats=None):
+    """Compile latex_content `runs` times; return (per-run seconds, runs that fell back to a plain compile)"""
+    timings, fallbacks = [], 0
+    for i in range(runs):
+        output_path = os.path.join(work_dir, f'bench_{i}.pdf')
+        info = {}
+        start = time.perf_counter()
+        error = compile_latex(latex_content, output_path, formats=formats, info=info)
+        timings.append(time.perf_counter() - start)
+        if error:
+            raise RuntimeError(error)
+        if formats is not None and not info['fmt']:
+            fallbacks += 1
+    return timings, fallbacks
+
+def summarize(timings):
+    return {'median_ms': round(statistics.median(timings) * 1000, 1),
+            'mean_ms': round(statistics.mean(timings) * 1000, 1),
+            'min_ms': round(min(timings) * 1000, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-resume compile latency: plain vs. preloaded format')
+    parser.add_argument('--job', default=DEFAULT_JOB, help='Job description JSON to render')
+    parser.add_argument('--runs', type=int, default=5, help='Compiles per mode')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+
+    args = parser.parse_args()
+
+    job_file = args.job
+    if not os.path.exists(job_file):
+        print(f"Error: Job description file '{job_file}' not found")
+        sys.exit(1)
+
+    master_data, job_data = load_data(MASTER_PATH, job_file)
+    latex_content = render_latex(tailor_content(master_data, job_data), load_template(TEMPLATE_PATH))
+
+    with tempfile.TemporaryDirectory(prefix='bench_compile_') as work_dir:
+        formats = FormatCache(os.path.join(work_dir, 'formats'))
+        try:
+            plain, _ = time_compiles(latex_content, work_dir, args.runs)
+
+            start = time.perf_counter()
+            fmt_path = formats.format_for(latex_content)
+            build = time.perf_counter() - start
+            if fmt_path is None:
+                print("Error: could not dump the preamble format (is mylatexformat installed?)")
+                sys.exit(1)
+
+            preloaded, fallbacks = time_compiles(latex_content, work_dir, args.runs, formats=formats)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    results = {
+        'job': job_file,
+        'runs': args.runs,
+        'format_build_ms': round(build * 1000, 1),
+        'plain': summarize(plain),
+        'preloaded': summarize(preloaded),
+        'speedup': round(statistics.median(plain) / statistics.median(preloaded), 2),
+        'fallbacks': fallbacks,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"\n⏱️  Compile Benchmark ({os.path.basename(job_file)}, {args.runs} runs per mode)")
+        for mode in ('plain', 'preloaded'):
+            r = results[mode]
+            print(f"  {mode:<10} median {r['median_ms']:7.1f} ms | mean {r['mean_ms']:7.1f} ms | min {r['min_ms']:7.1f} ms")
+        print(f"  One-off format dump: {results['format_build_ms']:.1f} ms")
+        print(f"  Speedup: {results['speedup']:.2f}x")
+
+    # A preloaded run that could not load the format was an ordinary
+    # compile, so its timing says nothing about the format
+    if fallbacks:
+        print(f"❌ {fallbacks} of {args.runs} preloaded compiles fell back to a plain compile; "
+              "the speedup is not meaningful")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Time each generate_resume stage on synthetic master profiles of growing size and compare against a baseline
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+from generate_resume import (
+    load_data, calculate_skill_relevance, prioritize_projects, tailor_content,
+    load_template, render_latex
+)
+
+TEMPLATE_PATH = 'templates/resume_template.tex'
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_JOBS = 10
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+# Stage differences below this many ms are timer noise, never a regression
+NOISE_FLOOR_MS = 0.05
+
+STAGES = ('load_data', 'calculate_skill_relevance', 'prioritize_projects',
+          'tailor_content', 'render', 'compile')
+
+TERMS = [
+    'python', 'sql', 'spark', 'aws', 'gcp', 'azure', 'docker', 'kubernetes', 'airflow', 'kafka',
+    'tableau', 'pandas', 'numpy', 'pytorch', 'tensorflow', 'nlp', 'llm', 'etl', 'dbt', 'snowflake',
+    'statistics', 'regression', 'clustering', 'forecasting', 'visualization', 'governance',
+    'lineage', 'metadata', 'mlops', 'deployment', 'recommender', 'vision', 'transformers',
+    'scala', 'java', 'r', 'excel', 'looker', 'bigquery', 'redshift', 'postgres', 'mongodb',
+    'hadoop', 'hive', 'git', 'ci/cd', 'terraform', 'linux', 'optimization', 'experimentation',
+]
+
+def synthetic_master(size, seed=0):
+    """A master_content-shaped profile with `size` skills, projects and experience entries"""
+    rng = random.Random(seed)
+
+    def phrase(n):
+        return ' '.join(rng.sample(TERMS, n))
+
+    return {
+        'personal': {'name': 'Synthetic Candidate', 'title': 'Data Engineer',
+                     'email': 'candidate@example.com', 'phone': '555-0100',
+                     'linkedin': 'https://example.com/in/candidate',
+                     'github': 'https://example.com/candidate', 'location': 'Boston, MA'},
+        'summary': 'Synthetic profile for benchmarking. ' + phrase(8),
+        'education': [{'university': 'Example University', 'location': 'Boston, MA',
+                       'degree': 'MS in Data Engineering', 'graduation': '2026', 'gpa': '4.0'}],
+        'skills': [f'{phrase(2).title()} {i}' for i in range(size)],
+        'projects': [
+            {'name': f'Project {i}', 'tools': ', '.join(rng.sample(TERMS, 4)),
+             'description': phrase(12), 'github_link': f'https://example.com/p{i}',
+             'keywords': rng.sample(TERMS, 5)}
+            for i in range(size)
+        ],
+        'experience': [
+            {'company': f'Company {i}', 'title': 'Engineer', 'location': 'Remote',
+             'duration': '2020 - 2024', 'tech_focus': phrase(6), 'platforms': phrase(4),
+             'bullets': [phrase(10), phrase(10)], 'keywords': rng.sample(TERMS, 5)}
+            for i in range(size)
+        ],
+        'languages': ['English'],
+        'certifications': [{'name': 'Example Certification', 'skills': phrase(4)}],
+    }
+
+def synthetic_job(seed=0):
+    """A job description drawing requirements and focus areas from the same vocabulary"""
+    rng = random.Random(seed)
+    return {
+        'title': 'Data Engineer',
+        'company': f'Employer {seed}',
+        'location': 'Boston, MA',
+        'description': ' '.join(rng.sample(TERMS, 20)),
+        'requirements': [' '.join(rng.sample(TERMS, 2)) for _ in range(8)],
+        'preferred': [' '.join(rng.sample(TERMS, 2)) for _ in range(4)],
+        'focus_areas': [' '.join(rng.sample(TERMS, 2)) for _ in range(4)],
+    }
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+def bench_size(size, jobs, repeat, work_dir, compile_pdf=False):
+    """Per-stage timing samples (ms) for one profile size"""
+    from compile_pool import compile_latex
+
+    master_path = os.path.join(work_dir, f'master_{size}.json')
+    with open(master_path, 'w') as f:
+        json.dump(synthetic_master(size, seed=size), f)
+
+    template = load_template(TEMPLATE_PATH)
+    samples = {stage: [] for stage in STAGES}
+    for job_no in range(jobs):
+        job_path = os.path.join(work_dir, f'job_{job_no}.json')
+        with open(job_path, 'w') as f:
+            json.dump(synthetic_job(job_no), f)
+
+        for _ in range(repeat):
+            (master_data, job_data), ms = timed(load_data, master_path, job_path)
+            samples['load_data'].append(ms)
+
+            requirements = job_data.get('requirements', []) + job_data.get('preferred', [])
+            _, ms = timed(calculate_skill_relevance, master_data['skills'], requirements)
+            samples['calculate_skill_relevance'].append(ms)
+
+            _, ms = timed(prioritize_projects, master_data['projects'], job_data)
+            samples['prioritize_projects'].append(ms)
+
+            tailored_data, ms = timed(tailor_content, master_data, job_data)
+            samples['tailor_content'].append(ms)
+
+            latex_content, ms = timed(render_latex, tailored_data, template)
+            samples['render'].append(ms)
+
+            if compile_pdf:
+                error, ms = timed(compile_latex, latex_content, os.path.join(work_dir, 'bench.pdf'))
+                if error:
+                    raise RuntimeError(error)
+                samples['compile'].append(ms)
+
+    return {stage: {'median_ms': round(statistics.median(values), 4),
+                    'min_ms': round(min(values), 4), 'samples': len(values)}
+            for stage, values in samples.items() if values}
+
+def run(sizes, jobs, repeat, compile_pdf=False):
+    work_dir = tempfile.mkdtemp(prefix='bench_pipeline_')
+    try:
+        results = {str(size): bench_size(size, jobs, repeat, work_dir, compile_pdf) for size in sizes}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                 'sizes': list(sizes), 'jobs': jobs, 'repeat': repeat, 'compile': compile_pdf},
+        'results': results,
+    }
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Stage-by-stage median comparison; returns rows for every stage in both runs"""
+    rows = []
+    for size, stages in current['results'].items():
+        for stage, stats in stages.items():
+            base = baseline.get('results', {}).get(size, {}).get(stage)
+            if base is None:
+                continue
+            now, before = stats['median_ms'], base['median_ms']
+            ratio = now / before if before else float('inf')
+            regressed = ratio > 1 + tolerance and now - before > NOISE_FLOOR_MS
+            rows.append({'size': size, 'stage': stage, 'baseline_ms': before, 'current_ms': now,
+                         'ratio': round(ratio, 3), 'regressed': regressed})
+    return rows
+
+def print_results(report):
+    print(f"\n⏱️  Pipeline Benchmark ({report['meta']['jobs']} jobs x {report['meta']['repeat']} repeats, median ms)")
+    stages = [s for s in STAGES if any(s in r for r in report['results'].values())]
+    print(f"  {'size':>6}  " + '  '.join(f"{s[:14]:>14}" for s in stages))
+    for size, results in report['results'].items():
+        print(f"  {size:>6}  " + '  '.join(f"{results[s]['median_ms']:14.3f}" for s in stages))
+
+def print_comparison(rows, tolerance):
+    print(f"\n📊 Against baseline (regression = more than {tolerance:.0%} slower)")
+    for row in rows:
+        status = '❌' if row['regressed'] else '✅'
+        print(f"  {status} {row['size']:>6} {row['stage']:<26} {row['baseline_ms']:10.3f} -> "
+              f"{row['current_ms']:10.3f} ms ({row['ratio']:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-stage benchmark of the resume generation pipeline')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated profile sizes (skills, projects and experience entries)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Synthetic job descriptions per size')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Runs per job')
+    parser.add_argument('--compile', action='store_true', help='Also time the pdflatex compile')
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--baseline', help='Compare against a previous --output file; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown ratio before a stage counts as regressed')
+    parser.add_argument('--json', action='store_true', help='Print the JSON results')
+
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    except ValueError:
+        print(f"Error: invalid --sizes '{args.sizes}'")
+        sys.exit(1)
+    if not os.path.exists(TEMPLATE_PATH):
+        print(f"Error: Template file '{TEMPLATE_PATH}' not found")
+        sys.exit(1)
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: could not read baseline: {e}")
+            sys.exit(1)
+
+    try:
+        report = run(sizes, args.jobs, args.repeat, args.compile)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    rows = compare(report, baseline, args.tolerance) if baseline else []
+    if baseline:
+        report['comparison'] = {'baseline': args.baseline, 'tolerance': args.tolerance, 'stages': rows}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_results(report)
+        if baseline:
+            print_comparison(rows, args.tolerance)
+
+    if any(row['regressed'] for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measure CLI import/startup cost with `python -X importtime` and flag regressions
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+# name -> (argv after the interpreter, import budget above a bare
+# interpreter as a multiple of the bare interpreter's own import time,
+# modules that must not be imported on that path). Scaling by the
+# baseline tracks machine speed; the multiples sit about twice above
+# typical runs, so only a real regression (or a forbidden heavy module,
+# which is checked exactly) fails the gate
+CASES = {
+    'generate_resume usage': (
+        ['generate_resume.py'], 6,
+        ('jinja2', 'sqlite3', 'tracker_db', 'subprocess', 'numpy', 'scipy', 'sklearn')),
+    'generate_resume missing-job': (
+        ['generate_resume.py', 'missing.json', 'out'], 6,
+        ('jinja2', 'sqlite3', 'tracker_db', 'subprocess', 'numpy', 'scipy', 'sklearn')),
+    'batch_generate usage': (
+        ['batch_generate.py'], 9,
+        ('jinja2', 'sqlite3', 'numpy', 'scipy', 'sklearn', 'master_profile')),
+    'job_tracker summary': (
+        ['job_tracker.py', 'summary'], 6,
+        ('jinja2', 'subprocess', 'numpy', 'scipy', 'sklearn')),
+    'job_tracker weekly': (
+        ['job_tracker.py', 'weekly'], 6,
+        ('jinja2', 'subprocess', 'numpy', 'scipy', 'sklearn')),
+    'job_tracker list': (
+        ['job_tracker.py', 'list'], 6,
+        ('jinja2', 'subprocess', 'numpy', 'scipy', 'sklearn')),
+    'job_tracker followup': (
+        ['job_tracker.py', 'followup'], 6,
+        ('jinja2', 'subprocess', 'numpy', 'scipy', 'sklearn')),
+    'daily_apply import': (
+        ['-c', 'import daily_apply'], 4,
+        ('webbrowser', 'sqlite3', 'job_tracker', 'jinja2')),
+}
+
+def import_profile(argv, cwd):
+    """Run the interpreter with -X importtime; return (total import us, module names)"""
+    env = dict(os.environ, PYTHONPATH=SCRIPTS_DIR)
+    # Time imports from cached bytecode, as an installed CLI runs; compiling
+    # the scripts from source on every run would dominate the noise
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    args = [sys.executable, '-X', 'importtime']
+    args += [os.path.join(SCRIPTS_DIR, argv[0])] + argv[1:] if argv[0].endswith('.py') else argv
+    result = subprocess.run(args, cwd=cwd, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+
+    total, modules = 0, set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        if not match.group(3):
+            total += int(match.group(2))
+    return total, modules
+
+def measure(argv, cwd, runs):
+    """Best-of-N import time in ms plus the union of imported modules, after one discarded warm-up run"""
+    import_profile(argv, cwd)
+    best, seen = None, set()
+    for _ in range(runs):
+        total, modules = import_profile(argv, cwd)
+        best = total if best is None else min(best, total)
+        seen |= modules
+    return best / 1000, seen
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI startup-time benchmark')
+    parser.add_argument('--runs', type=int, default=7, help='Runs per case (best is kept)')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+    parser.add_argument('--slack', type=float, default=1.0, help='Multiply every budget by this factor')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as cwd:
+        baseline, _ = measure(['-c', 'pass'], cwd, args.runs)
+        results = []
+        for name, (argv, factor, forbidden) in CASES.items():
+            elapsed, modules = measure(argv, cwd, args.runs)
+            over = elapsed - baseline
+            budget = factor * baseline * args.slack
+            loaded = sorted(m for m in forbidden if m in modules)
+            ok = over <= budget and not loaded
+            results.append({'case': name, 'import_ms': round(over, 2),
+                            'budget_ms': round(budget, 2), 'forbidden_loaded': loaded, 'ok': ok})
+
+    if args.json:
+        print(json.dumps({'baseline_ms': round(baseline, 2), 'results': results}, indent=2))
+    else:
+        print(f"\n⏱️  Startup Benchmark (bare interpreter: {baseline:.1f} ms)")
+        for r in results:
+            status = '✅' if r['ok'] else '❌'
+            extra = f" | loaded: {', '.join(r['forbidden_loaded'])}" if r['forbidden_loaded'] else ''
+            print(f"  {status} {r['case']:<30} {r['import_ms']:7.1f} ms (budget {r['budget_ms']:.0f} ms){extra}")
+
+    if not all(r['ok'] for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+LaTeX Compile Pool
+Run pdflatex jobs concurrently, each in its own isolated temporary directory
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+import instrumentation
+from latex_format import is_format_error
+
+DEFAULT_TIMEOUT = 120
+
+CompileResult = namedtuple('CompileResult', ['name', 'output_path', 'error', 'elapsed', 'pages'])
+
+_PAGES = re.compile(r'Output written on .*?\(\s*(\d+)\s+pages?', re.S)
+
+def pages_written(output):
+    """Page count pdflatex reported in its console output or .log, or None"""
+    match = _PAGES.search(output or '')
+    return int(match.group(1)) if match else None
+
+def _wait(proc, timeout):
+    """Reap proc, killing it after timeout; return (returncode, rusage or None, timed_out)
+
+    os.wait4 reports the resources used by this one child, which stays
+    accurate when several compiles run at once in a CompilePool.
+    """
+    if not hasattr(os, 'wait4'):
+        try:
+            return proc.wait(timeout), None, False
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            return proc.wait(), None, True
+
+    killed = []
+    timer = threading.Timer(timeout, lambda: (killed.append(True), proc.kill()))
+    timer.start()
+    try:
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    except ChildProcessError:
+        # Reaped by the timer's kill() racing the child's exit
+        usage = None
+    finally:
+        timer.cancel()
+    return proc.returncode, usage, bool(killed)
+
+def _run_pdflatex(tex_path, work_dir, timeout, fmt_name=None):
+    """Run pdflatex once in work_dir; return (error message or None, console output)"""
+    args = ['pdflatex', '-interaction=nonstopmode', '-halt-on-error']
+    if fmt_name:
+        args.append(f'-fmt={fmt_name}')
+    start = time.perf_counter()
+    try:
+        with tempfile.TemporaryFile(dir=work_dir) as out:
+            proc = subprocess.Popen(args + ['-output-directory', work_dir, tex_path],
+                                    stdout=out, stderr=subprocess.DEVNULL, cwd=work_dir)
+            returncode, usage, timed_out = _wait(proc, timeout)
+            out.seek(0)
+            stdout = out.read().decode('utf-8', errors='replace')
+    except OSError as e:
+        return f"could not run pdflatex: {e}", ''
+
+    if instrumentation.enabled():
+        wall_ms = (time.perf_counter() - start) * 1000
+        user_ms = round(usage.ru_utime * 1000, 3) if usage else None
+        sys_ms = round(usage.ru_stime * 1000, 3) if usage else None
+        instrumentation.event('pdflatex', wall_ms=wall_ms,
+                              cpu_ms=user_ms + sys_ms if usage else None,
+                              user_ms=user_ms, sys_ms=sys_ms,
+                              maxrss_kb=usage.ru_maxrss if usage else None,
+                              returncode=returncode, fmt=fmt_name,
+                              job=os.path.basename(tex_path))
+        instrumentation.count('pdflatex.runs')
+
+    if timed_out:
+        return f"pdflatex timed out after {timeout}s", stdout
+    if returncode != 0:
+        log_tail = '\n'.join(stdout.strip().splitlines()[-20:])
+        return f"LaTeX compilation error:\n{log_tail}", stdout
+    return None, stdout
+
+def _keep_log(work_dir, job_name, output_dir):
+    """Copy a failed run's pdflatex .log next to the output; return its path or None"""
+    log_path = os.path.join(work_dir, f'{job_name}.log')
+    if not os.path.exists(log_path):
+        return None
+    kept = os.path.join(output_dir, f'{job_name}.log')
+    shutil.copyfile(log_path, kept)
+    return kept
+
+def compile_latex(latex_content, output_path, timeout=DEFAULT_TIMEOUT,
+                  cache=None, template_path=None, formats=None, info=None):
+    """Compile LaTeX source into output_path
+
+    pdflatex runs inside a private temporary directory, so concurrent
+    compiles never share .aux/.log files. When a PdfCache is given, a hit
+    skips pdflatex entirely. When a FormatCache is given, the document is
+    compiled against its preloaded preamble format, falling back to a
+    normal compile if the format is missing, unusable or the run fails.
+    Returns None on success or an error message on failure; a failed
+    run's full pdflatex log is kept as <output name>.log. When an `info`
+    dict is given, info['pages'] is set to the page count pdflatex
+    reported and info['fmt'] to whether the PDF came from the preloaded
+    format (both None on a cache hit).
+    """
+    if cache is not None:
+        key = cache.key(latex_content, template_path)
+        if cache.fetch(key, output_path):
+            instrumentation.count('pdf_cache.hit')
+            if info is not None:
+                info['pages'] = info['fmt'] = None
+            return None
+        instrumentation.count('pdf_cache.miss')
+
+    output_dir = os.path.dirname(output_path) or '.'
+    os.makedirs(output_dir, exist_ok=True)
+    job_name = os.path.splitext(os.path.basename(output_path))[0]
+    fmt_path = formats.format_for(latex_content) if formats is not None else None
+
+    with tempfile.TemporaryDirectory(prefix='resume_') as work_dir:
+        tex_path = os.path.join(work_dir, f'{job_name}.tex')
+        with open(tex_path, 'w') as f:
+            f.write(latex_content)
+
+        error, fell_back = None, False
+        if fmt_path:
+            # pdflatex looks up -fmt names in the working directory first
+            fmt_name = os.path.splitext(os.path.basename(fmt_path))[0]
+            try:
+                os.symlink(os.path.abspath(fmt_path), os.path.join(work_dir, f'{fmt_name}.fmt'))
+                error, output = _run_pdflatex(tex_path, work_dir, timeout, fmt_name)
+            except OSError as e:
+                error, output = str(e), ''
+            if error:
+                fell_back = True
+                instrumentation.count('format.fallback')
+                if is_format_error(output):
+                    formats.discard(fmt_path)
+
+        if not fmt_path or error:
+            error, output = _run_pdflatex(tex_path, work_dir, timeout)
+        if error:
+            instrumentation.count('compile.failed')
+            log_path = _keep_log(work_dir, job_name, output_dir)
+            return f"{error}\nFull log: {log_path}" if log_path else error
+        if info is not None:
+            info['pages'] = pages_written(output)
+            info['fmt'] = bool(fmt_path) and not fell_back
+
+        shutil.move(os.path.join(work_dir, f'{job_name}.pdf'), output_path)
+
+    if cache is not None:
+        cache.store(key, output_path)
+    return None
+
+class CompilePool:
+    """Bounded pool of concurrent pdflatex compiles
+
+    Each worker thread drives one pdflatex subprocess, so up to `workers`
+    compiles run in parallel. `submit` blocks once `workers * 2` jobs are
+    waiting, which keeps memory flat when feeding thousands of resumes.
+    A failing or timed-out job is recorded in its result and never stops
+    the rest of the batch. The pool keeps no reference to finished jobs;
+    callers hold on to the Futures `submit` returns for as long as they
+    need them.
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT, cache=None, template_path=None,
+                 formats=None):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache = cache
+        self.template_path = template_path
+        self.formats = formats
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='pdflatex')
+        self._pending = threading.BoundedSemaphore(self.workers * 2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, name, latex_content, output_path):
+        """Queue a compile and return its Future"""
+        self._pending.acquire()
+        try:
+            future = self._executor.submit(self._run, name, latex_content, output_path)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def _run(self, name, latex_content, output_path):
+        start = time.perf_counter()
+        info = {}
+        try:
+            with instrumentation.stage('compile', job=name):
+                error = compile_latex(latex_content, output_path, self.timeout,
+                                      cache=self.cache, template_path=self.template_path,
+                                      formats=self.formats, info=info)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return CompileResult(name, output_path, error, time.perf_counter() - start,
+                             info.get('pages'))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
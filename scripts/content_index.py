@@ -0,0 +1,126 @@
+"""
+Master Content Index
+Inverted keyword index over the master profile for fast per-job relevance scoring
+"""
+
+from collections import defaultdict
+
+# Tools strings are indexed by every substring up to this many characters
+TOOL_GRAM = 3
+
+# Keywords matched by scanning the tools strings before an index builds its
+# gram index. A scan runs at C speed, so one job's keywords are cheaper to
+# scan than to index for; a profile scoring many jobs indexes once and from
+# then on each lookup costs in proportion to the keyword, not the profile
+TOOL_SCANS = 64
+
+def job_keywords(phrases):
+    """Lower-case, whitespace-split a list of job phrases into a keyword set"""
+    keywords = set()
+    for phrase in phrases:
+        keywords.update(phrase.lower().split())
+    return keywords
+
+class MasterContentIndex:
+    """Pre-tokenized inverted index over skills, projects and experience
+
+    Built once per master profile. Each scoring method walks only the job's
+    keywords and their posting lists, so the cost of scoring a job no
+    longer depends on re-splitting or re-scanning the master content.
+    The scores match calculate_skill_relevance, prioritize_projects and
+    the experience loop in tailor_content exactly.
+    """
+
+    def __init__(self, master_data):
+        self.skills = master_data.get('skills', [])
+        self.projects = master_data.get('projects', [])
+        self.experience = master_data.get('experience', [])
+
+        # skill word -> indices of skills containing it
+        self.skill_words = defaultdict(list)
+        for i, skill in enumerate(self.skills):
+            for word in set(skill.lower().split()):
+                self.skill_words[word].append(i)
+
+        # project keyword -> [(project index, occurrences)]
+        self.project_keywords = defaultdict(list)
+        for i, project in enumerate(self.projects):
+            counts = defaultdict(int)
+            for keyword in project.get('keywords', []):
+                counts[keyword.lower()] += 1
+            for keyword, count in counts.items():
+                self.project_keywords[keyword].append((i, count))
+
+        # Tools match on any substring. tool_grams maps every substring of up
+        # to TOOL_GRAM characters to the projects whose lower-cased tools
+        # contain it (linear in the tools length, unlike indexing every
+        # substring); it is built after TOOL_SCANS lookups
+        self.project_tools = [project.get('tools', '').lower() for project in self.projects]
+        self.tool_grams = None
+        self._tool_scans = 0
+
+        # experience keyword -> indices of experience entries tagged with it
+        self.experience_keywords = defaultdict(list)
+        for i, exp in enumerate(self.experience):
+            for keyword in set(kw.lower() for kw in exp.get('keywords', [])):
+                self.experience_keywords[keyword].append(i)
+
+    def skill_scores(self, keywords):
+        """Word overlap between each skill and the job keywords"""
+        scores = [0] * len(self.skills)
+        for keyword in keywords:
+            for i in self.skill_words.get(keyword, ()):
+                scores[i] += 1
+        return scores
+
+    def project_scores(self, keywords):
+        """Two points per matching project keyword plus one per keyword found in its tools"""
+        scores = [0] * len(self.projects)
+        for keyword in keywords:
+            for i, count in self.project_keywords.get(keyword, ()):
+                scores[i] += 2 * count
+            for i in self.tool_matches(keyword):
+                scores[i] += 1
+        return scores
+
+    def tool_matches(self, keyword):
+        """Indices of projects whose tools contain keyword as a substring
+
+        Short keywords are looked up directly in the gram index. Longer ones
+        intersect the projects containing each of their TOOL_GRAM-character
+        grams, rarest first, and only those candidates are checked for the
+        whole keyword.
+        """
+        if self.tool_grams is None:
+            if self._tool_scans < TOOL_SCANS:
+                self._tool_scans += 1
+                return [i for i, tools in enumerate(self.project_tools) if keyword in tools]
+            self.tool_grams = self._index_tools()
+
+        if len(keyword) <= TOOL_GRAM:
+            return self.tool_grams.get(keyword, ())
+        postings = []
+        for start in range(len(keyword) - TOOL_GRAM + 1):
+            projects = self.tool_grams.get(keyword[start:start + TOOL_GRAM])
+            if not projects:
+                return ()
+            postings.append(projects)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in candidates if keyword in self.project_tools[i]]
+
+    def _index_tools(self):
+        grams = defaultdict(list)
+        for i, tools in enumerate(self.project_tools):
+            for gram in {tools[start:start + n] for n in range(1, TOOL_GRAM + 1)
+                         for start in range(len(tools) - n + 1)}:
+                grams[gram].append(i)
+        return grams
+
+    def experience_scores(self, keywords):
+        """Overlap between each experience entry's keywords and the job keywords"""
+        scores = [0] * len(self.experience)
+        for keyword in keywords:
+            for i in self.experience_keywords.get(keyword, ()):
+                scores[i] += 1
+        return scores
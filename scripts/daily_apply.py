@@ -5,13 +5,17 @@ Streamlines the daily job application process
 """
 
 import os
+import sys
 import json
-import webbrowser
 from datetime import datetime
-from job_tracker import JobTracker
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
 
 class DailyApplyAssistant:
     def __init__(self):
+        from job_tracker import JobTracker
+        
         self.tracker = JobTracker()
         self.job_sites = {
             'linkedin': 'https://www.linkedin.com/jobs/search/?keywords=data%20engineer%20machine%20learning&location=Boston%2C%20Massachusetts&f_TPR=r86400',
@@ -44,6 +48,7 @@ class DailyApplyAssistant:
         
         response = input("Open job sites in browser? (y/n): ").lower()
         if response == 'y':
+            import webbrowser
             for site, url in self.job_sites.items():
                 print(f"Opening {site}...")
                 webbrowser.open(url)
@@ -132,7 +137,10 @@ class DailyApplyAssistant:
         }
         
         # Save job description
-        job_filename = f"data/job_descriptions/{company.lower().replace(' ', '_')}_{position.lower().replace(' ', '_')}.json"
+        job_filename = os.path.join(
+            REPO_ROOT, 'data', 'job_descriptions',
+            f"{company.lower().replace(' ', '_')}_{position.lower().replace(' ', '_')}.json"
+        )
         os.makedirs(os.path.dirname(job_filename), exist_ok=True)
         
         with open(job_filename, 'w') as f:
@@ -142,7 +150,21 @@ class DailyApplyAssistant:
         output_name = f"{company.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}"
         
         print(f"Generating resume for {company}...")
-        os.system(f"cd /Users/rosalinatorres/resume-generator && python scripts/generate_resume.py {job_filename} {output_name}")
+        import subprocess
+        from render_daemon import render_remote
+        try:
+            # The application is tracked by add_application_interactive, so don't log it here too
+            output_path = render_remote(job_data, output_name)
+            print(f"Resume generated successfully: {output_path}")
+        except ConnectionError:
+            # No render daemon running: fall back to a one-off generate_resume.py run
+            subprocess.run(
+                [sys.executable, os.path.join(SCRIPTS_DIR, 'generate_resume.py'),
+                 job_filename, output_name, '--no-log'],
+                cwd=REPO_ROOT
+            )
+        except RuntimeError as e:
+            print(f"Error generating resume: {e}")
     
     def get_common_requirements(self, position):
         """Get common requirements based on position type"""
@@ -0,0 +1,184 @@
+"""
+Posting Deduplication
+Flag reposted jobs with MinHash/LSH and skip roles already in the applications table
+"""
+
+import os
+import re
+import sqlite3
+import zlib
+from collections import deque
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Legal-form suffixes that scrapers attach inconsistently to company names
+COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+                    'co', 'company', 'plc', 'gmbh'}
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+SHINGLE_SIZE = 3
+
+# Applications at most this many days old count as already applied for;
+# a role re-posted after that is a new opening
+DEFAULT_KNOWN_DAYS = 180
+
+# Universal hashing modulo a prime just above 2**32; coefficients stay
+# below 2**31 so a * x + b never overflows uint64
+_PRIME = np.uint64(4294967311)
+
+def posting_key(company, position):
+    """Normalized (company, position) key used to match postings to applications"""
+    company_words = TOKEN_PATTERN.findall(str(company or '').lower())
+    while company_words and company_words[-1] in COMPANY_SUFFIXES:
+        company_words.pop()
+    position_words = TOKEN_PATTERN.findall(str(position or '').lower())
+    return ' '.join(company_words), ' '.join(position_words)
+
+def known_application_keys(conn, days=None):
+    """Posting keys of the applications in the tracker, or of those applied for in the last `days` days"""
+    sql = 'SELECT company, position FROM applications'
+    params = ()
+    if days:
+        sql += " WHERE date_applied >= date('now', 'localtime', ?)"
+        params = (f'-{int(days)} days',)
+    return {posting_key(company, position) for company, position in conn.execute(sql, params)}
+
+def posting_text(job_data):
+    """The fields that identify a posting: title, company, description and requirements"""
+    parts = [job_data.get('title'), job_data.get('company'), job_data.get('description')]
+    for field in ('requirements', 'preferred'):
+        parts.extend(job_data.get(field) or [])
+    return ' '.join(str(part) for part in parts if part)
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Hashed word n-gram shingles of text as a uint64 array"""
+    words = TOKEN_PATTERN.findall(text.lower())
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64)
+
+class MinHasher:
+    """num_perm independent hash functions applied to a shingle set at once"""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, shingle_hashes):
+        """MinHash signature (uint32 per permutation), or None for an empty set"""
+        if not len(shingle_hashes):
+            return None
+        hashed = (self.a * shingle_hashes[None, :] + self.b) % _PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+class Deduplicator:
+    """Streaming near-duplicate detector
+
+    Each posting's MinHash signature is cut into `bands` bands and every
+    band is hashed into a bucket; postings sharing any bucket are
+    candidates, and a candidate is a duplicate when the estimated Jaccard
+    similarity of the two signatures reaches `threshold`. A lookup touches
+    only the few postings in its buckets, not everything seen so far.
+    Postings whose normalized company and title match an existing
+    application (`known_keys`) are flagged before any hashing.
+
+    State costs about 6 KB per remembered posting. With `window` set,
+    only the most recent `window` postings are remembered and older ones
+    are evicted, so memory stays bounded on an endless stream at the cost
+    of missing reposts further apart than that.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 bands=DEFAULT_BANDS, known_keys=None, window=None):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.known_keys = set(known_keys or ())
+        self.window = window
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+        self.names = {}
+        self._order = deque()
+        self._next_id = 0
+
+    def check(self, job_data, name=None):
+        """Return why job_data is a duplicate, or None after recording it as new"""
+        key = posting_key(job_data.get('company'), job_data.get('title'))
+        if key in self.known_keys:
+            return 'already in applications'
+
+        signature = self.hasher.signature(shingles(posting_text(job_data)))
+        if signature is None:
+            return None
+
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, band_keys):
+            candidates.update(bucket.get(band_key, ()))
+        for candidate in sorted(candidates):
+            similarity = float(np.mean(self.signatures[candidate] == signature))
+            if similarity >= self.threshold:
+                return f"near-duplicate of {self.names[candidate]} ({similarity:.2f})"
+
+        posting_id = self._next_id
+        self._next_id += 1
+        self.signatures[posting_id] = signature
+        self.names[posting_id] = name if name is not None else str(posting_id)
+        self._order.append((posting_id, band_keys))
+        for bucket, band_key in zip(self.buckets, band_keys):
+            bucket.setdefault(band_key, []).append(posting_id)
+        if self.window is not None and len(self._order) > self.window:
+            self._evict()
+        return None
+
+    def _evict(self):
+        """Forget the oldest remembered posting"""
+        posting_id, band_keys = self._order.popleft()
+        del self.signatures[posting_id]
+        del self.names[posting_id]
+        for bucket, band_key in zip(self.buckets, band_keys):
+            # Ids enter each bucket in order, so the oldest is always first
+            members = bucket[band_key]
+            members.pop(0)
+            if not members:
+                del bucket[band_key]
+
+def filter_jobs(jobs, deduplicator, skipped):
+    """Drop duplicates from a (name, job_data, error) stream, recording them in skipped"""
+    for name, job_data, error in jobs:
+        if error is None:
+            reason = deduplicator.check(job_data, name)
+            if reason:
+                skipped.append({'name': name, 'output': None, 'error': None, 'skipped': reason})
+                continue
+        yield name, job_data, error
+
+def application_deduplicator(db_path=None, days=DEFAULT_KNOWN_DAYS, **options):
+    """A Deduplicator preloaded with the tracker's applications from the last `days` days
+
+    The tracker is opened read-only and never created. Without one (a
+    first run) only near-duplicate postings are caught, with a warning.
+    days=None or 0 counts every application, however old.
+    """
+    from tracker_db import DEFAULT_DB_PATH
+
+    db_path = db_path or DEFAULT_DB_PATH
+    if not os.path.exists(db_path):
+        print(f"⚠️  No tracker database at '{db_path}'; only skipping near-duplicate postings")
+        return Deduplicator(**options)
+    conn = sqlite3.connect(f'file:{os.path.abspath(db_path)}?mode=ro', uri=True)
+    try:
+        known_keys = known_application_keys(conn, days)
+    finally:
+        conn.close()
+    return Deduplicator(known_keys=known_keys, **options)
@@ -2,12 +2,14 @@
 import json
 import os
 import sys
-from jinja2 import Template
-import subprocess
-from datetime import datetime
-import re
-from collections import Counter
-import sqlite3
+import argparse
+import heapq
+import instrumentation
+from content_index import MasterContentIndex, job_keywords
+
+# jinja2, sqlite3, subprocess (via compile_pool) and the PDF cache are
+# imported inside the functions that use them, so the usage and
+# validation error paths start without loading them.
 
 def load_data(master_path, job_path):
     """Load master content and job description"""
@@ -19,164 +21,137 @@ def load_data(master_path, job_path):
     
     return master_data, job_data
 
-def calculate_skill_relevance(skills, job_requirements):
+def calculate_skill_relevance(skills, job_requirements, index=None):
     """Calculate relevance score for skills based on job requirements"""
-    job_keywords = set()
-    for req in job_requirements:
-        job_keywords.update(req.lower().split())
-    
-    skill_scores = {}
-    for skill in skills:
-        skill_words = set(skill.lower().split())
-        overlap = len(skill_words.intersection(job_keywords))
-        skill_scores[skill] = overlap
+    if index is None:
+        index = MasterContentIndex({'skills': skills})
     
-    return skill_scores
+    scores = index.skill_scores(job_keywords(job_requirements))
+    return {skill: score for skill, score in zip(index.skills, scores)}
 
-def prioritize_projects(projects, job_data):
+def prioritize_projects(projects, job_data, index=None, scores=None):
     """Prioritize projects based on job focus areas and requirements"""
-    focus_areas = job_data.get('focus_areas', [])
-    requirements = job_data.get('requirements', [])
-    preferred = job_data.get('preferred', [])
-    
-    job_keywords = set()
-    for area in focus_areas + requirements + preferred:
-        job_keywords.update(area.lower().split())
-    
-    project_scores = []
-    for project in projects:
-        score = 0
-        # Check keywords in project
-        for keyword in project.get('keywords', []):
-            if keyword.lower() in job_keywords:
-                score += 2
-        
-        # Check tools relevance
-        tools_text = project.get('tools', '').lower()
-        for keyword in job_keywords:
-            if keyword in tools_text:
-                score += 1
-        
-        project_scores.append((project, score))
+    if index is None:
+        index = MasterContentIndex({'projects': projects})
+    
+    if scores is None:
+        focus_areas = job_data.get('focus_areas', [])
+        requirements = job_data.get('requirements', [])
+        preferred = job_data.get('preferred', [])
+        scores = index.project_scores(job_keywords(focus_areas + requirements + preferred))
     
-    # Sort by score (highest first) and return top 3
-    project_scores.sort(key=lambda x: x[1], reverse=True)
-    return [p[0] for p in project_scores[:3]]
+    # Keep the 3 highest-scoring projects (nlargest is stable like a full sort)
+    order = heapq.nlargest(3, range(len(index.projects)), key=lambda i: scores[i])
+    return [index.projects[i] for i in order]
 
-def tailor_content(master_data, job_data):
-    """Customize resume based on job description"""
-    tailored = master_data.copy()
+def tailor(profile, job_data, relevance=None):
+    """Rank a frozen MasterProfile for one job, returning a TailoredResume view
     
-    # Customize summary with job-specific focus
-    company = job_data['company']
-    title = job_data['title']
-    base_summary = master_data['summary']
+    The profile is never modified or copied, so one loaded profile can be
+    shared by any number of jobs. Pass a RelevanceResult from a
+    RelevanceEngine to rank by TF-IDF similarity instead of keyword
+    overlap counts.
+    """
+    from master_profile import TailoredResume
     
     # Add job-specific context to summary
+    company = job_data['company']
+    title = job_data['title']
     job_focus = f" Seeking {title} role at {company} to apply expertise in machine learning and data engineering."
-    tailored['summary'] = base_summary + job_focus
-    
-    # Prioritize skills based on job requirements
-    all_requirements = job_data.get('requirements', []) + job_data.get('preferred', [])
-    skill_scores = calculate_skill_relevance(master_data['skills'], all_requirements)
-    
-    # Sort skills by relevance score
-    sorted_skills = sorted(master_data['skills'], 
-                          key=lambda x: skill_scores.get(x, 0), 
-                          reverse=True)
-    tailored['skills'] = sorted_skills
-    
-    # Prioritize and limit projects to most relevant
-    tailored['projects'] = prioritize_projects(master_data['projects'], job_data)
-    
-    # Highlight relevant experience
-    for exp in tailored['experience']:
-        exp_keywords = exp.get('keywords', [])
-        job_keywords = set()
-        for req in all_requirements:
-            job_keywords.update(req.lower().split())
+    
+    if relevance is not None:
+        skill_scores, project_scores, exp_scores = relevance
+    else:
+        with instrumentation.stage('score'):
+            all_requirements = job_data.get('requirements', []) + job_data.get('preferred', [])
+            requirement_keywords = job_keywords(all_requirements)
+            focus_keywords = job_keywords(job_data.get('focus_areas', []) + all_requirements)
+            skill_scores = profile.index.skill_scores(requirement_keywords)
+            project_scores = profile.index.project_scores(focus_keywords)
+            exp_scores = profile.index.experience_scores(requirement_keywords)
+    
+    with instrumentation.stage('rank'):
+        # Sort skills by relevance score
+        skill_order = sorted(range(len(profile.skills)), key=lambda i: skill_scores[i], reverse=True)
         
-        # Mark experience as highly relevant if keywords match
-        exp['relevance_score'] = len(set(kw.lower() for kw in exp_keywords).intersection(job_keywords))
+        # Keep the 3 most relevant projects (nlargest is stable like a full sort)
+        project_order = heapq.nlargest(3, range(len(profile.projects)), key=lambda i: project_scores[i])
+        
+        # Sort experience by relevance (keeping current job first)
+        exp_order = sorted(range(len(profile.experience)),
+                           key=lambda i: (i == 0, exp_scores[i]), reverse=True)
+    
+    return TailoredResume(
+        profile, job_focus, tuple(skill_order), tuple(project_order), tuple(exp_order),
+        tuple(skill_scores), tuple(project_scores), tuple(exp_scores)
+    )
+
+def tailor_content(master_data, job_data, relevance=None):
+    """Customize resume based on job description
     
-    # Sort experience by relevance (keeping current job first)
-    exp_with_scores = [(i, exp) for i, exp in enumerate(tailored['experience'])]
-    exp_with_scores.sort(key=lambda x: (x[0] == 0, x[1]['relevance_score']), reverse=True)
-    tailored['experience'] = [exp for _, exp in exp_with_scores]
+    Returns the template context as plain dicts and lists; master_data is
+    left untouched. Batch callers should build one MasterProfile and call
+    tailor directly.
+    """
+    from master_profile import MasterProfile, thaw
     
-    return tailored
+    with instrumentation.stage('build_profile'):
+        profile = MasterProfile.from_dict(master_data)
+    tailored = tailor(profile, job_data, relevance)
+    with instrumentation.stage('context'):
+        return thaw(tailored.context())
 
 def log_application(job_data, output_path):
     """Log job application to tracking database"""
-    db_path = 'data/applications.db'
-    
-    # Create database if it doesn't exist
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS applications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company TEXT NOT NULL,
-            position TEXT NOT NULL,
-            location TEXT,
-            date_applied TEXT NOT NULL,
-            resume_path TEXT,
-            status TEXT DEFAULT 'applied',
-            notes TEXT
-        )
-    ''')
-    
-    # Insert application record
-    cursor.execute('''
-        INSERT INTO applications (company, position, location, date_applied, resume_path)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (
-        job_data['company'],
-        job_data['title'],
-        job_data.get('location', ''),
-        datetime.now().strftime('%Y-%m-%d'),
-        output_path
-    ))
-    
-    conn.commit()
-    conn.close()
+    import tracker_db
+    
+    conn = tracker_db.connect()
+    with conn:
+        tracker_db.insert_applications(conn, [{
+            'company': job_data['company'],
+            'position': job_data['title'],
+            'location': job_data.get('location', ''),
+            'resume_path': output_path
+        }])
+    
     print(f"Application logged for {job_data['company']} - {job_data['title']}")
 
-def generate_pdf(tailored_data, template_path, output_path):
-    """Generate PDF from tailored data"""
+def load_template(template_path):
+    """Load the LaTeX template through the shared, cached Jinja2 environment"""
+    from templating import get_template
+    
+    return get_template(template_path)
+
+def render_latex(tailored_data, template):
+    """Render tailored data into LaTeX source"""
+    # The template header reads name/title/contact fields at the top level
+    context = dict(tailored_data.get('personal') or {})
+    context.update(tailored_data)
+    return template.render(**context)
+
+def generate_pdf(tailored_data, template_path, output_path, template=None, cache=None,
+                 formats=None, info=None):
+    """Generate PDF from tailored data (info, if given, receives the page count)"""
+    from compile_pool import compile_latex
+    
     try:
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Load template
-        with open(template_path, 'r') as f:
-            template = Template(f.read())
+        # Load template unless a precompiled one was passed in
+        if template is None:
+            with instrumentation.stage('load_template'):
+                template = load_template(template_path)
         
         # Render LaTeX
-        latex_content = template.render(**tailored_data)
-        
-        # Write temporary LaTeX file
-        temp_tex = output_path.replace('.pdf', '.tex')
-        with open(temp_tex, 'w') as f:
-            f.write(latex_content)
-        
-        # Compile to PDF
-        result = subprocess.run(
-            ['pdflatex', '-output-directory', os.path.dirname(output_path), temp_tex],
-            capture_output=True, text=True
-        )
+        with instrumentation.stage('render'):
+            latex_content = render_latex(tailored_data, template)
         
-        if result.returncode != 0:
-            print(f"LaTeX compilation error: {result.stderr}")
+        # Compile to PDF in an isolated working directory
+        with instrumentation.stage('compile'):
+            error = compile_latex(latex_content, output_path, cache=cache,
+                                  template_path=template_path, formats=formats, info=info)
+        if error:
+            print(error)
             return False
         
-        # Clean up auxiliary files
-        for ext in ['.aux', '.log', '.tex']:
-            temp_file = output_path.replace('.pdf', ext)
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-        
         print(f"Resume generated successfully: {output_path}")
         return True
         
@@ -184,14 +159,86 @@ def generate_pdf(tailored_data, template_path, output_path):
         print(f"Error generating PDF: {e}")
         return False
 
+def run(args, master_path, template_path, output_path):
+    """Tailor and write one resume (or preview) as requested on the command line"""
+    # Load data
+    with instrumentation.stage('load_data'):
+        master_data, job_data = load_data(master_path, args.job_file)
+    
+    # Tailor content
+    relevance = None
+    if args.tfidf:
+        with instrumentation.stage('tfidf'):
+            from relevance_engine import RelevanceEngine
+            relevance = RelevanceEngine.load(master_path).score_jobs([job_data])[0]
+    
+    if args.format != 'pdf':
+        # Preview only: no LaTeX, no pdflatex and nothing logged
+        from master_profile import MasterProfile
+        from preview import write_preview
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with instrumentation.stage('build_profile'):
+            profile = MasterProfile.from_dict(master_data)
+        tailored = tailor(profile, job_data, relevance)
+        with instrumentation.stage('preview'):
+            write_preview(tailored, job_data, args.format, output_path)
+        print(f"Preview for {job_data['company']} - {job_data['title']}: {output_path}")
+        return
+    
+    plan = None
+    with instrumentation.stage('tailor_content'):
+        if args.one_page:
+            # Trim to the predicted one-page budget before the single compile
+            from master_profile import MasterProfile, thaw
+            from layout_budget import Layout, fit, describe
+            tailored, plan = fit(tailor(MasterProfile.from_dict(master_data), job_data, relevance),
+                                 Layout.load(template_path))
+            tailored_data = thaw(tailored.context())
+            print(describe(plan))
+        else:
+            tailored_data = tailor_content(master_data, job_data, relevance=relevance)
+    
+    # Generate PDF
+    from pdf_cache import PdfCache
+    cache = None if args.no_cache else PdfCache()
+    formats = None
+    if args.fmt:
+        from latex_format import FormatCache
+        formats = FormatCache()
+    info = {}
+    with instrumentation.stage('generate_pdf'):
+        success = generate_pdf(tailored_data, template_path, output_path,
+                               cache=cache, formats=formats, info=info)
+    
+    if success and plan is not None and (info.get('pages') or 1) > 1:
+        print(f"⚠️  Predicted one page but pdflatex wrote {info['pages']}; "
+              f"run 'python scripts/layout_budget.py calibrate' to re-measure the template")
+    
+    if success and not args.no_log:
+        # Log application
+        with instrumentation.stage('log_application'):
+            log_application(job_data, output_path)
+        
+    print(f"\nResume tailored for {job_data['company']} - {job_data['title']}")
+    print(f"Generated: {output_path}")
+
 def main():
-    if len(sys.argv) not in [3, 4]:
-        print("Usage: python generate_resume.py <job_description.json> <output_name> [--no-log]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Generate a tailored resume')
+    parser.add_argument('job_file', help='Job description JSON file')
+    parser.add_argument('output_name', help='Output name (without .pdf)')
+    parser.add_argument('--no-log', action='store_true', help='Do not log the application')
+    parser.add_argument('--no-cache', action='store_true', help='Always recompile, bypassing the PDF cache')
+    parser.add_argument('--tfidf', action='store_true', help='Rank content by TF-IDF similarity instead of keyword overlap')
+    parser.add_argument('--fmt', action='store_true', help='Compile against a cached preamble format (needs mylatexformat)')
+    parser.add_argument('--format', choices=['pdf', 'json', 'markdown', 'html'], default='pdf',
+                        help='Output format; json/markdown/html preview the selection without pdflatex')
+    parser.add_argument('--one-page', action='store_true',
+                        help="Keep only the highest-scoring content predicted to fit on one page")
+    instrumentation.add_arguments(parser)
     
-    job_file = sys.argv[1]
-    output_name = sys.argv[2]
-    log_application_flag = '--no-log' not in sys.argv
+    args = parser.parse_args()
+    job_file = args.job_file
+    output_name = args.output_name
     
     # Validate input files exist
     master_path = 'data/master_content.json'
@@ -209,28 +256,24 @@ def main():
         print(f"Error: Template file '{template_path}' not found")
         sys.exit(1)
     
-    output_path = f'output/{output_name}.pdf'
+    from preview import EXTENSIONS
+    output_path = f'output/{output_name}{EXTENSIONS[args.format]}'
     
+    recorder = instrumentation.setup(args)
     try:
-        # Load data
-        master_data, job_data = load_data(master_path, job_file)
-        
-        # Tailor content
-        tailored_data = tailor_content(master_data, job_data)
-        
-        # Generate PDF
-        success = generate_pdf(tailored_data, template_path, output_path)
-        
-        if success and log_application_flag:
-            # Log application
-            log_application(job_data, output_path)
-            
-        print(f"\nResume tailored for {job_data['company']} - {job_data['title']}")
-        print(f"Generated: {output_path}")
-        
+        if args.cprofile is not None:
+            with instrumentation.profiled(args.cprofile or None):
+                run(args, master_path, template_path, output_path)
+        else:
+            run(args, master_path, template_path, output_path)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if recorder is not None:
+            if args.profile:
+                recorder.print_summary()
+            recorder.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Job Feed Ingestion
+Stream large (optionally gzip/zstd-compressed) JSONL job feeds through validate, normalize,
+score and filter stages, writing kept postings out in bounded-size JSONL chunks
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import gzip
+import argparse
+from collections import Counter
+
+from batch_generate import slugify, iter_chunks, SCORE_CHUNK, MASTER_PATH
+
+DEFAULT_CHUNK_ROWS = 50000
+
+# Postings --dedupe remembers; bounds its memory to roughly 130 MB
+DEFAULT_DEDUPE_WINDOW = 20000
+
+# Canonical field -> accepted spellings in scraped feeds, most preferred first
+FIELD_ALIASES = {
+    'title': ('title', 'position', 'job_title', 'role'),
+    'company': ('company', 'company_name', 'employer', 'organization'),
+    'location': ('location', 'job_location'),
+    'description': ('description', 'job_description'),
+    'company_goal': ('company_goal', 'mission'),
+    'requirements': ('requirements', 'qualifications'),
+    'preferred': ('preferred', 'preferred_qualifications', 'nice_to_have'),
+    'focus_areas': ('focus_areas', 'focus'),
+    'job_url': ('job_url', 'url', 'link', 'apply_url'),
+}
+
+REQUIRED_FIELDS = ('company', 'title')
+LIST_FIELDS = ('requirements', 'preferred', 'focus_areas')
+
+_LIST_SPLIT = re.compile(r'\s*(?:\n|;|•)\s*')
+_WHITESPACE = re.compile(r'\s+')
+
+def open_feed(path):
+    """Open a JSONL feed for streaming text reads, by extension
+
+    `-` reads stdin; `.gz` uses gzip; `.zst`/`.zstd` needs the optional
+    zstandard package.
+    """
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith(('.zst', '.zstd')):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("reading .zst feeds requires the zstandard package (pip install zstandard)")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def iter_records(lines):
+    """Parse JSONL lines, yielding (line_no, record, error); blank lines are skipped"""
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except ValueError as e:
+            yield line_no, None, f"invalid JSON: {e}"
+
+def _clean(text):
+    return _WHITESPACE.sub(' ', str(text)).strip()
+
+def normalize(record):
+    """Map a scraped posting onto the job description schema
+
+    Field aliases are resolved, strings are whitespace-collapsed and list
+    fields given as one string are split on newlines, semicolons and
+    bullets. Unknown fields are dropped. Raises ValueError when the
+    record is unusable.
+    """
+    if not isinstance(record, dict):
+        raise ValueError('record is not a JSON object')
+
+    job = {}
+    for field, aliases in FIELD_ALIASES.items():
+        value = next((record[a] for a in aliases if record.get(a) not in (None, '', [])), None)
+        if value is None:
+            continue
+        if field in LIST_FIELDS:
+            if isinstance(value, str):
+                value = _LIST_SPLIT.split(value)
+            elif not isinstance(value, list):
+                raise ValueError(f"'{field}' must be a list or string")
+            value = [_clean(v) for v in value if isinstance(v, str) and v.strip()]
+        elif isinstance(value, (dict, list)):
+            raise ValueError(f"'{field}' must be a string")
+        else:
+            value = _clean(value)
+        job[field] = value
+
+    for field in REQUIRED_FIELDS:
+        if not job.get(field):
+            raise ValueError(f"missing '{field}'")
+    return job
+
+def validated(records, stats):
+    """Normalize each parsed record, counting and dropping unusable ones"""
+    for line_no, record, error in records:
+        stats['read'] += 1
+        if error is None:
+            try:
+                yield line_no, normalize(record)
+                continue
+            except ValueError as e:
+                error = str(e)
+        stats['invalid'] += 1
+        stats[f"invalid: {error.split(':')[0]}"] += 1
+
+def unique(jobs, deduplicator, stats):
+    """Drop reposts and postings already in the tracker before they are scored"""
+    for line_no, job in jobs:
+        if deduplicator.check(job, f"line {line_no}"):
+            stats['duplicate'] += 1
+            continue
+        yield line_no, job
+
+def scored(jobs, profile, engine=None):
+    """Tailor each (key, job) pair against the profile, yielding (key, job, tailored)
+
+    Jobs are scored SCORE_CHUNK at a time, so at most one chunk is held in
+    memory; with a RelevanceEngine each chunk is one matrix product.
+    """
+    from generate_resume import tailor
+
+    for chunk in iter_chunks(jobs, SCORE_CHUNK):
+        relevance = engine.score_jobs([job for _, job in chunk]) if engine is not None else None
+        for i, (key, job) in enumerate(chunk):
+            yield key, job, tailor(profile, job, relevance[i] if relevance is not None else None)
+
+def kept(scored_jobs, stats, min_score=0.0):
+    """Keep postings whose fit score reaches min_score, as output rows"""
+    for line_no, job, tailored in scored_jobs:
+        if tailored.score < min_score:
+            stats['dropped'] += 1
+            continue
+        stats['kept'] += 1
+        sections = tailored.section_scores()
+        row = dict(job, output_name=slugify(f"{job['company']}_{job['title']}") or f"line_{line_no}")
+        row['fit'] = {'score': round(tailored.score, 4), 'line': line_no,
+                      **{section: round(value, 4) for section, value in sections.items()}}
+        yield row
+
+class ChunkWriter:
+    """Write rows as JSONL into numbered part files of at most max_rows rows
+
+    Each part is written under a temporary name and renamed when it is
+    complete, so readers never see a half-written chunk. If the `with`
+    block fails, the part in progress is deleted rather than renamed.
+    """
+
+    def __init__(self, output_dir, max_rows=DEFAULT_CHUNK_ROWS, compress=False, prefix='part'):
+        self.output_dir = output_dir
+        self.max_rows = max_rows
+        self.compress = compress
+        self.prefix = prefix
+        self.paths = []
+        self._file = None
+        self._tmp_path = None
+        self._rows = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _open(self):
+        extension = '.jsonl.gz' if self.compress else '.jsonl'
+        path = os.path.join(self.output_dir, f'{self.prefix}-{len(self.paths):05d}{extension}')
+        self._tmp_path = path + '.tmp'
+        if self.compress:
+            self._file = gzip.open(self._tmp_path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self.paths.append(path)
+        self._rows = 0
+
+    def write(self, row):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(row, ensure_ascii=False))
+        self._file.write('\n')
+        self._rows += 1
+        if self._rows >= self.max_rows:
+            self.close()
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._tmp_path, self.paths[-1])
+        self._file = None
+
+    def abort(self):
+        """Close and delete the part in progress without publishing it"""
+        if self._file is None:
+            return
+        self._file.close()
+        os.remove(self._tmp_path)
+        self.paths.pop()
+        self._file = None
+
+def ingest(feed_path, profile, output_dir, engine=None, min_score=0.0,
+           chunk_rows=DEFAULT_CHUNK_ROWS, compress=False, limit=None, deduplicator=None):
+    """Run the whole pipeline over one feed; return (stats Counter, written chunk paths)"""
+    stats = Counter()
+    with open_feed(feed_path) as lines, ChunkWriter(output_dir, chunk_rows, compress) as writer:
+        jobs = validated(iter_records(lines), stats)
+        if deduplicator is not None:
+            jobs = unique(jobs, deduplicator, stats)
+        rows = kept(scored(jobs, profile, engine), stats, min_score)
+        for n, row in enumerate(rows, 1):
+            writer.write(row)
+            if limit and n >= limit:
+                break
+    return stats, writer.paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream a JSONL job feed into scored, filtered chunks')
+    parser.add_argument('feed', help='JSONL feed (.jsonl, .jsonl.gz, .jsonl.zst) or - for stdin')
+    parser.add_argument('--output-dir', default='output/ingested', help='Directory for the output chunks')
+    parser.add_argument('--min-score', type=float, default=0.0, help='Drop postings whose fit score is below this')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Maximum rows per output chunk')
+    parser.add_argument('--gzip', action='store_true', help='Gzip the output chunks')
+    parser.add_argument('--limit', type=int, help='Stop after keeping this many postings')
+    parser.add_argument('--tfidf', action='store_true', help='Score by TF-IDF similarity instead of keyword overlap')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Drop near-duplicate postings and roles already in the tracker')
+    parser.add_argument('--dedupe-window', type=int, default=DEFAULT_DEDUPE_WINDOW,
+                        help='Postings remembered for --dedupe (about 6 KB each); older ones are forgotten')
+    parser.add_argument('--tracker-db', default='data/applications.db',
+                        help='Existing tracker database whose applications --dedupe skips')
+    parser.add_argument('--dedupe-days', type=int,
+                        help='Skip roles applied for within this many days (default: 180, 0: ever)')
+
+    args = parser.parse_args()
+
+    if args.feed != '-' and not os.path.exists(args.feed):
+        print(f"Error: '{args.feed}' not found")
+        sys.exit(1)
+
+    from master_profile import MasterProfile
+    profile = MasterProfile.load(MASTER_PATH)
+    engine = None
+    if args.tfidf:
+        from relevance_engine import RelevanceEngine
+        engine = RelevanceEngine.load(MASTER_PATH)
+
+    try:
+        deduplicator = None
+        if args.dedupe:
+            from dedupe import application_deduplicator, DEFAULT_KNOWN_DAYS
+            days = DEFAULT_KNOWN_DAYS if args.dedupe_days is None else args.dedupe_days
+            deduplicator = application_deduplicator(args.tracker_db, days, window=args.dedupe_window)
+        stats, paths = ingest(args.feed, profile, args.output_dir, engine=engine,
+                              min_score=args.min_score, chunk_rows=args.chunk_rows,
+                              compress=args.gzip, limit=args.limit, deduplicator=deduplicator)
+    except (OSError, RuntimeError, EOFError, UnicodeDecodeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\n📥 Ingested {args.feed}")
+    print(f"Read: {stats['read']} | Invalid: {stats['invalid']} | Duplicates: {stats['duplicate']} | "
+          f"Dropped: {stats['dropped']} | Kept: {stats['kept']}")
+    for reason, count in sorted((k, v) for k, v in stats.items() if k.startswith('invalid: ')):
+        print(f"  ⚠️  {reason[len('invalid: '):]}: {count}")
+    for path in paths:
+        print(f"  ✅ {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Instrumentation
+Opt-in stage timers, counters and pdflatex resource usage, as a JSONL trace or a summary table
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+
+# json, threading and collections are imported by Recorder, so the
+# default (off) path costs the CLI scripts nothing at startup.
+
+_active = None
+_NULL = nullcontext()
+
+class Recorder:
+    """Collects stage timings, counters and events from every thread
+
+    Stages record wall time and the calling thread's CPU time. Events are
+    free-form (pdflatex runs report their own wall, user and system
+    time). Everything is aggregated for summary() and, when trace_path is
+    given, also appended to it as one JSON object per line.
+    """
+
+    def __init__(self, trace_path=None):
+        import threading
+        from collections import Counter
+
+        self.trace_path = trace_path
+        self.stages = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._trace = open(trace_path, 'a') if trace_path else None
+        self._start = time.perf_counter()
+
+    def _write(self, record):
+        import json
+        import threading
+
+        if self._trace is not None:
+            record['t_ms'] = round((time.perf_counter() - self._start) * 1000, 3)
+            record['thread'] = threading.current_thread().name
+            self._trace.write(json.dumps(record) + '\n')
+
+    def _add(self, name, wall_ms, cpu_ms):
+        calls, wall, cpu, peak = self.stages.get(name, (0, 0.0, 0.0, 0.0))
+        self.stages[name] = (calls + 1, wall + wall_ms, cpu + cpu_ms, max(peak, wall_ms))
+
+    @contextmanager
+    def stage(self, name, **fields):
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            cpu_ms = (time.thread_time() - cpu_start) * 1000
+            with self._lock:
+                self._add(name, wall_ms, cpu_ms)
+                self._write(dict(type='stage', name=name, wall_ms=round(wall_ms, 3),
+                                 cpu_ms=round(cpu_ms, 3), **fields))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+            self._write({'type': 'count', 'name': name, 'n': n})
+
+    def event(self, name, wall_ms=None, cpu_ms=None, **fields):
+        """Record a timed event measured elsewhere, such as a child process"""
+        with self._lock:
+            if wall_ms is not None:
+                self._add(name, wall_ms, cpu_ms or 0.0)
+            self._write(dict(type='event', name=name,
+                             wall_ms=round(wall_ms, 3) if wall_ms is not None else None,
+                             cpu_ms=round(cpu_ms, 3) if cpu_ms is not None else None, **fields))
+
+    def summary(self):
+        return {
+            'stages': {name: {'calls': calls, 'wall_ms': round(wall, 3), 'cpu_ms': round(cpu, 3),
+                              'max_ms': round(peak, 3)}
+                       for name, (calls, wall, cpu, peak) in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n📈 Profile")
+        print(f"  {'stage':<22} {'calls':>6} {'wall ms':>10} {'cpu ms':>10} {'max ms':>10}")
+        for name, s in summary['stages'].items():
+            print(f"  {name:<22} {s['calls']:>6} {s['wall_ms']:>10.1f} {s['cpu_ms']:>10.1f} {s['max_ms']:>10.1f}")
+        if summary['counters']:
+            print("  " + '  '.join(f"{name}={n}" for name, n in sorted(summary['counters'].items())))
+
+    def close(self):
+        if self._trace is not None:
+            self._write({'type': 'summary', **self.summary()})
+            self._trace.close()
+            self._trace = None
+
+def activate(recorder):
+    """Make recorder receive every stage/count/event call; None switches instrumentation off"""
+    global _active
+    _active = recorder
+    return recorder
+
+def stage(name, **fields):
+    """Time a block as stage `name`; a shared no-op when instrumentation is off"""
+    return _active.stage(name, **fields) if _active is not None else _NULL
+
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)
+
+def event(name, **fields):
+    if _active is not None:
+        _active.event(name, **fields)
+
+def enabled():
+    return _active is not None
+
+@contextmanager
+def profiled(output_path=None, top=15):
+    """Run the block under cProfile, printing the top functions and optionally dumping stats
+
+    Only the calling thread is profiled, which covers tailoring and
+    scoring; pdflatex time shows up in the stage summary instead.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output_path:
+            profiler.dump_stats(output_path)
+        print(f"\n🔬 cProfile (top {top} by cumulative time)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+
+def setup(args):
+    """Activate a Recorder when --profile or --trace was given; return it or None"""
+    if not (args.profile or args.trace):
+        return None
+    return activate(Recorder(args.trace))
+
+def add_arguments(parser):
+    """The --profile, --trace and --cprofile flags shared by the CLI scripts"""
+    parser.add_argument('--profile', action='store_true', help='Print per-stage timings and counters at the end')
+    parser.add_argument('--trace', help='Append a JSON-lines trace of every stage and pdflatex run to this file')
+    parser.add_argument('--cprofile', nargs='?', const='', metavar='FILE',
+                        help='Run under cProfile and print hot functions (optionally dump stats to FILE)')
@@ -4,11 +4,149 @@ Job Application Tracker
 Track daily applications and manage job search progress
 """
 
-import sqlite3
-import json
-import os
 from datetime import datetime, timedelta
+import sys
 import argparse
+import sqlite3
+import tracker_db
+
+# Report queries, shared by the report methods and the explain subcommand
+TODAY_APPLICATIONS_SQL = '''
+    SELECT company, position, status FROM applications
+    WHERE date_applied = ?
+    ORDER BY id DESC
+'''
+
+DAILY_GOAL_SQL = 'SELECT actual_applications FROM daily_goals WHERE date = ?'
+
+# Weekly, monthly, company and funnel reports read the trigger-maintained
+# rollup tables (see tracker_db._migration_4), never the whole table
+WEEKLY_BREAKDOWN_SQL = '''
+    SELECT date, SUM(applications) as count
+    FROM rollup_daily
+    WHERE date >= ?
+    GROUP BY date
+    ORDER BY date DESC
+'''
+
+WEEKLY_TOTAL_SQL = '''
+    SELECT COALESCE(SUM(applications), 0) FROM rollup_daily
+    WHERE date >= ?
+'''
+
+MONTHLY_SQL = '''
+    SELECT substr(date, 1, 7) AS month, status, SUM(applications)
+    FROM rollup_daily
+    WHERE date >= ?
+    GROUP BY month, status
+    ORDER BY month DESC, status
+'''
+
+COMPANIES_SQL = '''
+    SELECT company, status, applications FROM rollup_company
+'''
+
+COMPANY_SQL = '''
+    SELECT company, status, applications FROM rollup_company
+    WHERE company = ?
+'''
+
+FUNNEL_SQL = 'SELECT stage, applications FROM rollup_funnel ORDER BY stage'
+
+LIST_BY_STATUS_SQL = '''
+    SELECT id, company, position, date_applied, status, follow_up_date
+    FROM applications
+    WHERE status = ?
+    ORDER BY date_applied DESC
+    LIMIT ?
+'''
+
+LIST_SQL = '''
+    SELECT id, company, position, date_applied, status, follow_up_date
+    FROM applications
+    ORDER BY date_applied DESC
+    LIMIT ?
+'''
+
+FOLLOW_UP_SQL = '''
+    SELECT id, company, position, date_applied, follow_up_date
+    FROM applications
+    WHERE follow_up_date <= ? AND status = 'applied'
+    ORDER BY follow_up_date
+'''
+
+SEARCH_SQL = f'''
+    SELECT a.id, a.company, a.position, a.date_applied, a.status,
+           snippet(applications_fts, 3, '[', ']', '…', 12)
+    FROM applications_fts
+    JOIN applications a ON a.id = applications_fts.rowid
+    WHERE applications_fts MATCH ?
+    ORDER BY bm25(applications_fts, {', '.join(map(str, tracker_db.FTS_WEIGHTS))})
+    LIMIT ?
+'''
+
+SEARCH_BY_STATUS_SQL = SEARCH_SQL.replace(
+    'WHERE applications_fts MATCH ?', 'WHERE applications_fts MATCH ? AND a.status = ?'
+)
+
+# Status history reports walk status_events in event order per
+# application (see tracker_db._migration_5); events with an unknown time
+# (backfilled) still count as a step but never towards a duration
+HISTORY_SQL = '''
+    SELECT e.at, s.name, e.note
+    FROM status_events e JOIN statuses s ON s.code = e.status
+    WHERE e.application_id = ?
+    ORDER BY e.id
+'''
+
+# An application's first event is its 'applied' one; its first response
+# is the earliest later event with another status, skipped when its time
+# is unknown
+FIRST_RESPONSES_SQL = f'''
+    WITH firsts AS (
+        SELECT MIN(id) AS applied_id, MIN(id) FILTER (WHERE status != {tracker_db.APPLIED}) AS response_id
+        FROM status_events
+        GROUP BY application_id
+    ),
+    first_responses AS (
+        SELECT r.status, julianday(r.at) - julianday(a.at) AS days,
+               ROW_NUMBER() OVER (ORDER BY julianday(r.at) - julianday(a.at)) AS rank,
+               COUNT(*) OVER () AS total
+        FROM firsts
+        JOIN status_events r ON r.id = firsts.response_id
+        JOIN status_events a ON a.id = firsts.applied_id
+        WHERE r.at IS NOT NULL AND a.at IS NOT NULL
+    )
+'''
+
+RESPONSE_TIMES_SQL = FIRST_RESPONSES_SQL + '''
+    SELECT COUNT(*), AVG(days), MIN(days), MAX(days),
+           AVG(CASE WHEN rank IN ((total + 1) / 2, (total + 2) / 2) THEN days END)
+    FROM first_responses
+'''
+
+RESPONSES_BY_STATUS_SQL = FIRST_RESPONSES_SQL + '''
+    SELECT s.name, COUNT(*), AVG(days)
+    FROM first_responses JOIN statuses s ON s.code = first_responses.status
+    GROUP BY first_responses.status
+    ORDER BY COUNT(*) DESC
+'''
+
+STAGE_TIMES_SQL = '''
+    WITH timeline AS (
+        SELECT status, at,
+               LEAD(id) OVER (PARTITION BY application_id ORDER BY id) AS next_id,
+               LEAD(at) OVER (PARTITION BY application_id ORDER BY id) AS left_at
+        FROM status_events
+    )
+    SELECT s.name, COUNT(*), SUM(next_id IS NULL),
+           AVG(julianday(left_at) - julianday(at)),
+           MAX(julianday(left_at) - julianday(at)),
+           AVG(CASE WHEN next_id IS NULL THEN julianday('now', 'localtime') - julianday(at) END)
+    FROM timeline JOIN statuses s ON s.code = timeline.status
+    GROUP BY timeline.status
+    ORDER BY timeline.status
+'''
 
 class JobTracker:
     def __init__(self, db_path='data/applications.db'):
@@ -16,105 +154,73 @@ class JobTracker:
         self.init_database()
     
     def init_database(self):
-        """Initialize the applications database"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS applications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company TEXT NOT NULL,
-                position TEXT NOT NULL,
-                location TEXT,
-                date_applied TEXT NOT NULL,
-                resume_path TEXT,
-                status TEXT DEFAULT 'applied',
-                notes TEXT,
-                job_url TEXT,
-                follow_up_date TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS daily_goals (
-                date TEXT PRIMARY KEY,
-                target_applications INTEGER DEFAULT 1,
-                actual_applications INTEGER DEFAULT 0
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Open the shared connection, creating and migrating the database if needed"""
+        self.conn = tracker_db.connect(self.db_path)
     
     def add_application(self, company, position, location='', job_url='', notes=''):
         """Add a new job application"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        today = datetime.now().strftime('%Y-%m-%d')
-        follow_up = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-        
-        cursor.execute('''
-            INSERT INTO applications 
-            (company, position, location, date_applied, job_url, notes, follow_up_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (company, position, location, today, job_url, notes, follow_up))
-        
-        # Update daily count
-        cursor.execute('''
-            INSERT OR REPLACE INTO daily_goals (date, actual_applications)
-            VALUES (?, COALESCE(
-                (SELECT actual_applications FROM daily_goals WHERE date = ?) + 1, 
-                1
-            ))
-        ''', (today, today))
-        
-        conn.commit()
-        conn.close()
+        self.add_applications([{
+            'company': company, 'position': position, 'location': location,
+            'job_url': job_url, 'notes': notes
+        }])
         
         print(f"✅ Added application: {company} - {position}")
     
+    def add_applications(self, applications):
+        """Add many applications in a single transaction
+        
+        Each item is a dict with at least company and position; see
+        tracker_db.APPLICATION_COLUMNS for the optional keys.
+        """
+        with self.conn:
+            rows = tracker_db.insert_applications(self.conn, applications)
+            
+            # Update daily counts, once per distinct date
+            per_date = {}
+            date_index = tracker_db.APPLICATION_COLUMNS.index('date_applied')
+            for row in rows:
+                per_date[row[date_index]] = per_date.get(row[date_index], 0) + 1
+            
+            # Atomic increment: keeps target_applications and never loses
+            # a concurrent writer's update
+            self.conn.executemany('''
+                INSERT INTO daily_goals (date, actual_applications)
+                VALUES (?, ?)
+                ON CONFLICT(date) DO UPDATE
+                SET actual_applications = actual_applications + excluded.actual_applications
+            ''', list(per_date.items()))
+        
+        return len(rows)
+    
     def update_status(self, app_id, status, notes=''):
-        """Update application status"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE applications 
-            SET status = ?, notes = ?
-            WHERE id = ?
-        ''', (status, notes, app_id))
-        
-        conn.commit()
-        conn.close()
+        """Update application status; notes are appended to the application's notes and kept on the status event"""
+        if not self.update_statuses([(app_id, status, notes)]):
+            print(f"❌ Application #{app_id} not found")
+            return
         
         print(f"✅ Updated application #{app_id} status to: {status}")
     
+    def update_statuses(self, changes):
+        """Apply many (app_id, status, notes) changes in one transaction; return how many applications matched"""
+        with self.conn:
+            return tracker_db.update_statuses(self.conn, changes)
+    
     def daily_summary(self):
         """Show today's application progress"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         today = datetime.now().strftime('%Y-%m-%d')
         
         # Today's applications
-        cursor.execute('''
-            SELECT company, position, status FROM applications 
-            WHERE date_applied = ?
-            ORDER BY id DESC
-        ''', (today,))
+        cursor.execute(TODAY_APPLICATIONS_SQL, (today,))
         
         today_apps = cursor.fetchall()
         
         # Daily goal
-        cursor.execute('SELECT actual_applications FROM daily_goals WHERE date = ?', (today,))
+        cursor.execute(DAILY_GOAL_SQL, (today,))
         result = cursor.fetchone()
         actual = result[0] if result else 0
         
-        conn.close()
-        
         print(f"\n📊 Daily Summary ({today})")
         print(f"Goal: 1 application | Actual: {actual}")
         print(f"Status: {'✅ Goal Met!' if actual >= 1 else '⏰ Keep Going!'}")
@@ -128,30 +234,18 @@ class JobTracker:
     
     def weekly_report(self):
         """Show this week's progress"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
         
-        cursor.execute('''
-            SELECT date_applied, COUNT(*) as count 
-            FROM applications 
-            WHERE date_applied >= ?
-            GROUP BY date_applied
-            ORDER BY date_applied DESC
-        ''', (week_ago,))
+        cursor.execute(WEEKLY_BREAKDOWN_SQL, (week_ago,))
         
         weekly_data = cursor.fetchall()
         
-        cursor.execute('''
-            SELECT COUNT(*) FROM applications 
-            WHERE date_applied >= ?
-        ''', (week_ago,))
+        cursor.execute(WEEKLY_TOTAL_SQL, (week_ago,))
         
         total = cursor.fetchone()[0]
         
-        conn.close()
-        
         print(f"\n📈 Weekly Report (Last 7 Days)")
         print(f"Total Applications: {total}")
         print(f"Daily Average: {total/7:.1f}")
@@ -161,29 +255,158 @@ class JobTracker:
             for date, count in weekly_data:
                 print(f"  {date}: {count} applications")
     
+    def monthly_report(self, months=6):
+        """Show applications per month, broken down by current status"""
+        today = datetime.now()
+        year, month = divmod(today.year * 12 + today.month - 1 - (months - 1), 12)
+        since = f'{year:04d}-{month + 1:02d}-01'
+        
+        per_month = {}
+        for month_key, status, count in self.conn.execute(MONTHLY_SQL, (since,)):
+            per_month.setdefault(month_key, {})[status or 'unknown'] = count
+        
+        print(f"\n🗓️  Monthly Report (Last {months} Months)")
+        if not per_month:
+            print("No applications in this period.")
+            return
+        for month_key, statuses in per_month.items():
+            breakdown = ' | '.join(f"{status} {count}" for status, count in statuses.items())
+            print(f"  {month_key}: {sum(statuses.values())} applications ({breakdown})")
+    
+    def company_report(self, company=None, limit=10):
+        """Show the companies applied to most, with each one's current statuses"""
+        if company:
+            rows = self.conn.execute(COMPANY_SQL, (company,))
+        else:
+            rows = self.conn.execute(COMPANIES_SQL)
+        
+        per_company = {}
+        for name, status, count in rows:
+            per_company.setdefault(name, {})[status or 'unknown'] = count
+        
+        if not per_company:
+            print("No applications found.")
+            return
+        
+        ranked = sorted(per_company.items(), key=lambda item: sum(item[1].values()), reverse=True)
+        print(f"\n🏢 Applications by Company")
+        for name, statuses in ranked[:limit]:
+            breakdown = ' | '.join(f"{status} {count}" for status, count in sorted(statuses.items()))
+            print(f"  {name}: {sum(statuses.values())} ({breakdown})")
+    
+    def funnel_report(self):
+        """Show how many applications reached each funnel stage and the conversion between them"""
+        counts = dict(self.conn.execute(FUNNEL_SQL).fetchall())
+        applied = counts.get(0, 0)
+        
+        print(f"\n🔻 Application Funnel")
+        for stage, name in enumerate(tracker_db.FUNNEL_STAGES):
+            count = counts.get(stage, 0)
+            rates = []
+            if stage > 0 and counts.get(stage - 1):
+                rates.append(f"{count / counts[stage - 1]:.1%} of {tracker_db.FUNNEL_STAGES[stage - 1]}")
+            if stage > 1 and applied:
+                rates.append(f"{count / applied:.1%} of applied")
+            print(f"  {name:<10} {count:>6}" + (f"  ({', '.join(rates)})" if rates else ''))
+    
+    def import_file(self, path):
+        """Import applications from a .jsonl, .json, .csv or .npz file, skipping ones already tracked"""
+        import tracker_io
+        
+        read, inserted, invalid = tracker_io.import_file(self.conn, path)
+        
+        print(f"✅ Imported {inserted} of {read} applications from {path}")
+        if read - inserted - invalid:
+            print(f"   {read - inserted - invalid} already tracked (same company, position and date)")
+        if invalid:
+            print(f"   ⚠️  {invalid} skipped: not an object, or no company or position")
+    
+    def export_file(self, path, status=None):
+        """Export applications, in the web app's field names, to a .jsonl, .json, .csv or .npz file"""
+        import tracker_io
+        
+        count = tracker_io.export_file(self.conn, path, status)
+        
+        print(f"✅ Exported {count} applications to {path}")
+    
+    def history(self, app_id):
+        """Show every status an application has passed through"""
+        events = self.conn.execute(HISTORY_SQL, (app_id,)).fetchall()
+        if not events:
+            print(f"No history for application #{app_id}.")
+            return
+        
+        print(f"\n🕓 Status History for #{app_id}")
+        for at, status, note in events:
+            print(f"  {at or '(time unknown)':<19}  {status}" + (f"  - {note}" if note else ''))
+    
+    def response_report(self):
+        """Show how long employers take to respond after an application goes in"""
+        count, average, fastest, slowest, median = self.conn.execute(RESPONSE_TIMES_SQL).fetchone()
+        
+        print(f"\n⏱️  Time to First Response")
+        if not count:
+            print("  No responses recorded yet.")
+            return
+        print(f"  {count} responses: median {median:.1f} days, average {average:.1f}, "
+              f"fastest {fastest:.1f}, slowest {slowest:.1f}")
+        for status, n, days in self.conn.execute(RESPONSES_BY_STATUS_SQL):
+            print(f"  {status:<14} {n:>6}  avg {days:.1f} days")
+    
+    def stage_report(self):
+        """Show how long applications stay in each status before moving on"""
+        print(f"\n⏳ Time in Each Status")
+        print(f"  {'status':<14} {'entered':>8} {'now in':>7} {'avg days':>9} {'max days':>9} {'open avg':>9}")
+        
+        def days(value):
+            return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+        
+        for status, entered, current, average, longest, open_average in self.conn.execute(STAGE_TIMES_SQL):
+            print(f"  {status:<14} {entered:>8} {current:>7} {days(average)} {days(longest)} {days(open_average)}")
+    
+    def rebuild(self):
+        """Recompute the rollup tables (and the search index) from the applications table"""
+        with self.conn:
+            rollups = tracker_db.rebuild_rollups(self.conn)
+            if tracker_db.has_fts(self.conn):
+                self.conn.execute("INSERT INTO applications_fts (applications_fts) VALUES ('rebuild')")
+        
+        print(f"✅ Rebuilt rollups: {len(rollups['rollup_daily'])} day/status rows, "
+              f"{len(rollups['rollup_company'])} company/status rows, "
+              f"{rollups['rollup_funnel'][(0,)]} applications in the funnel")
+    
+    def check(self):
+        """Compare the rollups (and search index) with the applications table; True if consistent"""
+        mismatches = tracker_db.check_rollups(self.conn)
+        for table, key, stored, expected in mismatches[:20]:
+            print(f"  ❌ {table} {key}: stored {stored}, expected {expected}")
+        if len(mismatches) > 20:
+            print(f"  ... and {len(mismatches) - 20} more")
+        
+        fts_ok = True
+        if tracker_db.has_fts(self.conn):
+            try:
+                self.conn.execute("INSERT INTO applications_fts (applications_fts) VALUES ('integrity-check')")
+            except sqlite3.DatabaseError as e:
+                fts_ok = False
+                print(f"  ❌ search index: {e}")
+        
+        if mismatches or not fts_ok:
+            print("⚠️  Derived tables are out of sync; run 'job_tracker.py rebuild'")
+            return False
+        print("✅ Rollups and search index match the applications table")
+        return True
+    
     def list_applications(self, status=None, limit=10):
         """List recent applications"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         if status:
-            cursor.execute('''
-                SELECT id, company, position, date_applied, status, follow_up_date
-                FROM applications 
-                WHERE status = ?
-                ORDER BY date_applied DESC
-                LIMIT ?
-            ''', (status, limit))
+            cursor.execute(LIST_BY_STATUS_SQL, (status, limit))
         else:
-            cursor.execute('''
-                SELECT id, company, position, date_applied, status, follow_up_date
-                FROM applications 
-                ORDER BY date_applied DESC
-                LIMIT ?
-            ''', (limit,))
+            cursor.execute(LIST_SQL, (limit,))
         
         apps = cursor.fetchall()
-        conn.close()
         
         if not apps:
             print("No applications found.")
@@ -196,20 +419,13 @@ class JobTracker:
     
     def follow_up_reminders(self):
         """Show applications that need follow-up"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         today = datetime.now().strftime('%Y-%m-%d')
         
-        cursor.execute('''
-            SELECT id, company, position, date_applied, follow_up_date
-            FROM applications 
-            WHERE follow_up_date <= ? AND status = 'applied'
-            ORDER BY follow_up_date
-        ''', (today,))
+        cursor.execute(FOLLOW_UP_SQL, (today,))
         
         reminders = cursor.fetchall()
-        conn.close()
         
         if reminders:
             print(f"\n🔔 Follow-up Reminders")
@@ -218,10 +434,87 @@ class JobTracker:
                 print(f"    Applied: {applied} | Follow-up due: {follow_up}")
         else:
             print("\n✅ No follow-ups needed today!")
+    
+    def search(self, query, status=None, limit=10):
+        """Full-text search over company, position, location, notes and URL, best match first"""
+        if not tracker_db.has_fts(self.conn):
+            print("Error: search needs SQLite built with FTS5")
+            return
+        
+        match = tracker_db.match_query(query)
+        if not match:
+            print("Error: enter at least one search term")
+            return
+        
+        try:
+            if status:
+                results = self.conn.execute(SEARCH_BY_STATUS_SQL, (match, status, limit)).fetchall()
+            else:
+                results = self.conn.execute(SEARCH_SQL, (match, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"Error: invalid search '{query}': {e}")
+            return
+        
+        if not results:
+            print(f"No applications match '{query}'.")
+            return
+        
+        print(f"\n🔎 Search: {query} {f'({status})' if status else ''}")
+        for app_id, company, position, date, status, notes in results:
+            print(f"  #{app_id}: {company} - {position}")
+            print(f"    Applied: {date} | Status: {status}")
+            if notes and '[' in notes:
+                print(f"    Notes: {notes}")
+    
+    def explain_reports(self):
+        """Print the SQLite query plan behind each report"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        reports = [
+            ('summary: today\'s applications', TODAY_APPLICATIONS_SQL, (today,)),
+            ('summary: daily goal', DAILY_GOAL_SQL, (today,)),
+            ('weekly: daily breakdown', WEEKLY_BREAKDOWN_SQL, (today,)),
+            ('weekly: total', WEEKLY_TOTAL_SQL, (today,)),
+            ('monthly', MONTHLY_SQL, (today,)),
+            ('companies', COMPANIES_SQL, ()),
+            ('funnel', FUNNEL_SQL, ()),
+            ('list', LIST_SQL, (10,)),
+            ('list --status', LIST_BY_STATUS_SQL, ('applied', 10)),
+            ('followup', FOLLOW_UP_SQL, (today,)),
+            ('history', HISTORY_SQL, (1,)),
+            ('responses', RESPONSE_TIMES_SQL, ()),
+            ('stages', STAGE_TIMES_SQL, ()),
+        ]
+        if tracker_db.has_fts(self.conn):
+            reports.append(('search', SEARCH_SQL, ('"data"*', 10)))
+        
+        full_scans = 0
+        print("\n🔍 Query Plans")
+        for name, sql, params in reports:
+            print(f"\n  {name}")
+            # Window queries scan their own CTEs and subqueries, which SQLite
+            # announces as CO-ROUTINE/MATERIALIZE steps first
+            derived = set()
+            for _, _, _, detail in self.conn.execute('EXPLAIN QUERY PLAN ' + sql, params):
+                if detail.startswith(('CO-ROUTINE', 'MATERIALIZE')):
+                    derived.add(detail.split(' ', 1)[1])
+                # A bare "SCAN <table>" walks every row; index scans name the index.
+                # Rollup tables hold one row per group, so scanning them is the point
+                is_full_scan = (detail.startswith('SCAN') and 'INDEX' not in detail
+                                and not detail.startswith('SCAN rollup_')
+                                and detail.split(' ', 1)[1] not in derived)
+                full_scans += is_full_scan
+                print(f"    {'⚠️ ' if is_full_scan else '  '}{detail}")
+        
+        print(f"\n{'✅ No report does a full table scan' if not full_scans else f'⚠️  {full_scans} full table scan(s)'}")
 
 def main():
     parser = argparse.ArgumentParser(description='Job Application Tracker')
-    parser.add_argument('command', choices=['add', 'update', 'summary', 'weekly', 'list', 'followup'])
+    parser.add_argument('command', choices=['add', 'update', 'summary', 'weekly', 'monthly', 'companies', 'funnel',
+                                            'list', 'followup', 'explain', 'search', 'rebuild', 'check',
+                                            'history', 'responses', 'stages', 'import', 'export'])
+    parser.add_argument('target', nargs='?', metavar='QUERY_OR_FILE',
+                        help='Search terms (search; data* is a prefix, company:acme one column) '
+                             'or a .jsonl/.json/.csv/.npz file (import, export)')
     parser.add_argument('--company', help='Company name')
     parser.add_argument('--position', help='Position title')
     parser.add_argument('--location', help='Job location')
@@ -230,6 +523,7 @@ def main():
     parser.add_argument('--id', type=int, help='Application ID')
     parser.add_argument('--status', help='Application status')
     parser.add_argument('--limit', type=int, default=10, help='Limit results')
+    parser.add_argument('--months', type=int, default=6, help='Months covered by the monthly report')
     
     args = parser.parse_args()
     tracker = JobTracker()
@@ -255,11 +549,61 @@ def main():
     elif args.command == 'weekly':
         tracker.weekly_report()
     
+    elif args.command == 'monthly':
+        tracker.monthly_report(args.months)
+    
+    elif args.command == 'companies':
+        tracker.company_report(args.company, args.limit)
+    
+    elif args.command == 'funnel':
+        tracker.funnel_report()
+    
     elif args.command == 'list':
         tracker.list_applications(args.status, args.limit)
     
     elif args.command == 'followup':
         tracker.follow_up_reminders()
+    
+    elif args.command == 'explain':
+        tracker.explain_reports()
+    
+    elif args.command == 'search':
+        if not args.target:
+            print("Error: a search query is required, e.g. job_tracker.py search 'data eng*'")
+            return
+        tracker.search(args.target, args.status, args.limit)
+    
+    elif args.command == 'history':
+        if not args.id:
+            print("Error: --id is required for history")
+            return
+        tracker.history(args.id)
+    
+    elif args.command == 'responses':
+        tracker.response_report()
+    
+    elif args.command == 'stages':
+        tracker.stage_report()
+    
+    elif args.command in ('import', 'export'):
+        if not args.target:
+            print(f"Error: a file is required, e.g. job_tracker.py {args.command} applications.jsonl")
+            return
+        try:
+            if args.command == 'import':
+                tracker.import_file(args.target)
+            else:
+                tracker.export_file(args.target, args.status)
+        except (OSError, ValueError) as e:
+            print(f"❌ {args.command.capitalize()} failed: {e}")
+            sys.exit(1)
+    
+    elif args.command == 'rebuild':
+        tracker.rebuild()
+    
+    elif args.command == 'check':
+        if not tracker.check():
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
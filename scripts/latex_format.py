@@ -0,0 +1,145 @@
+"""
+LaTeX Formats
+Dump a template's preamble into a pdflatex .fmt file once and compile resume bodies against it
+"""
+
+import os
+import shutil
+import hashlib
+import subprocess
+import tempfile
+import threading
+
+import instrumentation
+from pdf_cache import pdflatex_version
+
+DEFAULT_FORMAT_DIR = 'output/.cache/formats'
+DEFAULT_KEEP = 4
+BUILD_TIMEOUT = 300
+
+BEGIN_DOCUMENT = '\\begin{document}'
+
+# Console messages pdflatex prints when a .fmt cannot be loaded
+FORMAT_ERRORS = ("format file", "Fatal format", "I'm stymied", "was written by")
+
+def split_preamble(latex_content):
+    """Return the text before \\begin{document}, or None if there is none"""
+    position = latex_content.find(BEGIN_DOCUMENT)
+    return latex_content[:position] if position >= 0 else None
+
+def is_format_error(output):
+    """True when pdflatex failed because the format itself could not be used"""
+    return any(marker in output for marker in FORMAT_ERRORS)
+
+class FormatCache:
+    """Preamble formats built with mylatexformat, one per distinct preamble
+
+    A format is named by the SHA-256 of the pdflatex version and the
+    preamble text, so editing the template's preamble or upgrading TeX
+    simply selects a new name; the old one is a stale entry that is
+    pruned later. Builds are serialized per process, and a preamble that
+    fails to dump is remembered so it is not retried on every job.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_FORMAT_DIR, keep=DEFAULT_KEEP):
+        self.cache_dir = cache_dir
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._failed = set()
+
+    def name(self, preamble):
+        digest = hashlib.sha256()
+        for part in (pdflatex_version(), preamble):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return f'resume-{digest.hexdigest()[:16]}'
+
+    def path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.fmt')
+
+    def format_for(self, latex_content):
+        """Path of a ready .fmt for this document's preamble, building it if needed
+
+        Returns None when the document has no preamble or the format
+        cannot be built, in which case the caller compiles normally.
+        """
+        preamble = split_preamble(latex_content)
+        if preamble is None:
+            return None
+        name = self.name(preamble)
+        fmt_path = self.path(name)
+        if os.path.exists(fmt_path):
+            return fmt_path
+
+        with self._lock:
+            if os.path.exists(fmt_path):
+                return fmt_path
+            if name in self._failed:
+                return None
+            with instrumentation.stage('format_build', format=name):
+                built = self.build(name, preamble)
+            if built:
+                return fmt_path
+            self._failed.add(name)
+            return None
+
+    def build(self, name, preamble, timeout=BUILD_TIMEOUT):
+        """Dump preamble into cache_dir/<name>.fmt; return False on failure"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='resume_fmt_') as work_dir:
+            tex_path = os.path.join(work_dir, f'{name}.tex')
+            with open(tex_path, 'w') as f:
+                f.write(preamble)
+                f.write(f'{BEGIN_DOCUMENT}\n\\end{{document}}\n')
+
+            try:
+                result = subprocess.run(
+                    ['pdflatex', '-ini', '-interaction=nonstopmode', '-halt-on-error',
+                     f'-jobname={name}', '&pdflatex', 'mylatexformat.ltx', tex_path],
+                    capture_output=True, text=True, errors='replace',
+                    cwd=work_dir, timeout=timeout
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return False
+
+            built = os.path.join(work_dir, f'{name}.fmt')
+            if result.returncode != 0 or not os.path.exists(built):
+                return False
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            os.close(fd)
+            try:
+                shutil.copyfile(built, tmp_path)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self.path(name))
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return False
+
+        self.prune()
+        return True
+
+    def discard(self, fmt_path):
+        """Drop a format pdflatex refused to load so the next job rebuilds it"""
+        try:
+            os.remove(fmt_path)
+        except FileNotFoundError:
+            pass
+
+    def prune(self, keep=None):
+        """Keep only the most recently built formats; return count removed"""
+        keep = self.keep if keep is None else keep
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        with os.scandir(self.cache_dir) as it:
+            formats = sorted((e for e in it if e.name.endswith('.fmt')),
+                             key=lambda e: e.stat().st_mtime, reverse=True)
+        removed = 0
+        for entry in formats[keep:]:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
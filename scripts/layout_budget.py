@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Layout Budget
+Predict each resume section's rendered height from a per-template calibration table and
+greedily keep the highest-scoring items that fit on one page, without trial compiles
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+from dataclasses import replace
+
+TEMPLATE_PATH = 'templates/resume_template.tex'
+MASTER_PATH = 'data/master_content.json'
+
+# Used when a template has no calibration table yet: the geometry of the
+# bundled template (10pt, letter paper, 0.5in margins, two 0.48\textwidth
+# columns) with Roboto's average character width estimated at 0.5em
+DEFAULT_CALIBRATION = {
+    'source': 'estimated',
+    'page_height': 722.7,
+    'slack': 12.0,
+    'line_height': 12.0,
+    'chars_per_line': {'full': 108, 'column': 52, 'bullet': 50},
+    'blocks': {'header': 85.0, 'section': 32.0},
+    'gaps': {'education': 8.0, 'certification': 5.0, 'project': 8.0, 'experience': 5.0},
+}
+
+# Typical resume prose, for measuring the average character width (no LaTeX specials)
+SAMPLE_TEXT = ('Built and deployed machine learning pipelines in Python, SQL and Spark, '
+               'improving model accuracy by 25 percent across 3 production systems')
+
+PROBE_BODY = r"""\begin{document}
+\newdimen\layoutprobe
+\typeout{LAYOUT page_height=\the\textheight}
+\typeout{LAYOUT line_height=\the\baselineskip}
+\typeout{LAYOUT full_width=\the\textwidth}
+\settowidth{\layoutprobe}{%(sample)s}
+\typeout{LAYOUT sample_width=\the\layoutprobe}
+\noindent\begin{minipage}[t]{0.48\textwidth}
+\typeout{LAYOUT column_width=\the\linewidth}
+\begin{itemize}\item\typeout{LAYOUT bullet_width=\the\linewidth}x\end{itemize}
+\end{minipage}
+\setbox0=\vbox{\hsize=0.48\textwidth\section{EXPERIENCE}}
+\typeout{LAYOUT section=\the\dimexpr\ht0+\dp0\relax}
+\setbox0=\vbox{\hsize=\textwidth\resumeheader{Name}{Title}\contactinfo{Phone}{Email}{LinkedIn}{GitHub}{Location}}
+\typeout{LAYOUT header=\the\dimexpr\ht0+\dp0\relax}
+\end{document}
+"""
+
+_PROBE_VALUE = re.compile(r'LAYOUT (\w+)=([\d.]+)pt')
+
+def layout_path(template_path):
+    """The calibration table kept next to a template: <template>.layout.json"""
+    return os.path.splitext(template_path)[0] + '.layout.json'
+
+def _lines(text, width):
+    """Lines text wraps to at `width` characters per line (word wrap, at least 1)"""
+    lines, used = 1, 0
+    for word in str(text or '').split():
+        if used and used + 1 + len(word) > width:
+            lines += 1
+            used = len(word)
+        else:
+            used += len(word) + (1 if used else 0)
+    return lines
+
+class Layout:
+    """Height model for one template, in TeX points
+
+    Every item's height is its wrapped line count times the line height,
+    plus the template's fixed vertical space around it. The numbers come
+    from the template's calibration table; see `calibrate`.
+    """
+
+    def __init__(self, calibration=None):
+        table = dict(DEFAULT_CALIBRATION)
+        table.update(calibration or {})
+        self.table = table
+        self.page_height = table['page_height']
+        self.slack = table['slack']
+        self.line_height = table['line_height']
+        self.chars = table['chars_per_line']
+        self.blocks = table['blocks']
+        self.gaps = table['gaps']
+
+    @classmethod
+    def load(cls, template_path=TEMPLATE_PATH):
+        """The template's calibration table, or the built-in estimate if it has none"""
+        try:
+            with open(layout_path(template_path), 'r') as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    @property
+    def budget(self):
+        return self.page_height - self.slack
+
+    def text(self, text, width='column'):
+        return _lines(text, self.chars[width]) * self.line_height
+
+    def section(self):
+        return self.blocks['section']
+
+    def header(self, fields):
+        return self.blocks['header'] + self.section() + self.text(fields.get('summary'), 'full')
+
+    def education(self, edu):
+        lines = (_lines(edu.get('university'), self.chars['column'])
+                 + _lines(f"{edu.get('location')} | {edu.get('graduation')} | {edu.get('gpa') or ''}",
+                          self.chars['column'])
+                 + _lines(edu.get('degree'), self.chars['column'])
+                 + (_lines(edu.get('abroad'), self.chars['column']) if edu.get('abroad') else 0))
+        return lines * self.line_height + self.gaps['education']
+
+    def skill(self, name):
+        return self.text(f"• {name}")
+
+    def languages(self, languages):
+        return self.section() + self.text(' | '.join(languages)) if languages else 0.0
+
+    def certification(self, cert):
+        return (self.text(cert.get('name')) + self.text(f"Skills: {cert.get('skills')}")
+                + self.gaps['certification'])
+
+    def project(self, project):
+        height = (self.text(project.get('name')) + self.text(f"Tools: {project.get('tools')}")
+                  + self.text(project.get('description')))
+        if project.get('github_link'):
+            height += self.line_height
+        return height + self.gaps['project']
+
+    def experience(self, exp):
+        height = (self.text(f"{exp.get('company')} -- {exp.get('title')}")
+                  + self.text(f"{exp.get('location')} | {exp.get('duration')}"))
+        for field, label in (('tech_focus', 'Technology Focus: '), ('platforms', 'Platforms: ')):
+            if exp.get(field):
+                height += self.text(label + exp[field])
+        for bullet in exp.get('bullets') or ():
+            height += self.text(bullet, 'bullet')
+        return height + self.gaps['experience']
+
+    def fixed_left(self, fields):
+        """Left column content that is always kept: education, languages, certifications"""
+        height = self.section() + sum(self.education(e) for e in fields.get('education') or ())
+        height += self.section()  # the SKILLS heading
+        height += self.languages(fields.get('languages') or ())
+        certifications = fields.get('certifications') or ()
+        if certifications:
+            height += self.section() + sum(self.certification(c) for c in certifications)
+        return height
+
+def fit(tailored, layout):
+    """Trim a TailoredResume so its predicted height fits one page
+
+    Skills fill the left column in relevance order. In the right column,
+    the current job and the best project are always kept; the remaining
+    experience entries and projects (the usual top three plus any other
+    project with a positive score) are taken in order of their score
+    relative to the best in their section, skipping any that no longer
+    fit. Kept items stay in their ranked order. Returns the trimmed
+    TailoredResume and a plan dict describing the prediction.
+    """
+    profile = tailored.profile
+    fields = profile.fields
+    available = layout.budget - layout.header(fields)
+
+    left = layout.fixed_left(fields)
+    skills = []
+    for i in tailored.skill_order:
+        height = layout.skill(profile.skills[i].name)
+        if left + height <= available:
+            skills.append(i)
+            left += height
+
+    ranked_projects = sorted(range(len(profile.projects)), key=lambda i: tailored.project_scores[i],
+                             reverse=True)
+    candidates = {'project': [i for i in ranked_projects
+                              if i in tailored.project_order or tailored.project_scores[i] > 0],
+                  'experience': list(tailored.experience_order)}
+    scores = {'project': tailored.project_scores, 'experience': tailored.experience_scores}
+    measure = {'project': lambda i: layout.project(profile.projects[i].data),
+               'experience': lambda i: layout.experience(profile.experience[i].data)}
+
+    right = sum(layout.section() for kind in candidates if candidates[kind])
+    kept = {'project': set(), 'experience': set()}
+    queue = []
+    for kind, items in candidates.items():
+        if not items:
+            continue
+        best = max(scores[kind][i] for i in items) or 1
+        pinned, rest = items[0], items[1:]
+        kept[kind].add(pinned)
+        right += measure[kind](pinned)
+        queue.extend((-scores[kind][i] / best, rank, kind, i) for rank, i in enumerate(rest, 1))
+
+    for _, _, kind, i in sorted(queue):
+        height = measure[kind](i)
+        if right + height <= available:
+            kept[kind].add(i)
+            right += height
+
+    project_order = tuple(i for i in candidates['project'] if i in kept['project'])
+    experience_order = tuple(i for i in candidates['experience'] if i in kept['experience'])
+    fitted = replace(tailored, skill_order=tuple(skills), project_order=project_order,
+                     experience_order=experience_order)
+    plan = {
+        'budget': round(layout.budget, 1),
+        'predicted': round(layout.budget - available + max(left, right), 1),
+        'left': round(left, 1),
+        'right': round(right, 1),
+        'dropped': {
+            'skills': [profile.skills[i].name for i in tailored.skill_order if i not in skills],
+            'projects': [profile.projects[i].name for i in candidates['project']
+                         if i not in kept['project']],
+            'experience': [profile.experience[i].company for i in candidates['experience']
+                           if i not in kept['experience']],
+        },
+        'source': layout.table['source'],
+    }
+    return fitted, plan
+
+def describe(plan):
+    """One-line summary of a fit plan"""
+    dropped = [f"{len(items)} {section}" for section, items in plan['dropped'].items() if items]
+    return (f"📐 Layout: predicted {plan['predicted']:.0f}/{plan['budget']:.0f}pt"
+            + (f", dropped {', '.join(dropped)}" if dropped else ', nothing dropped'))
+
+def calibrate(template_path=TEMPLATE_PATH, timeout=120):
+    """Measure the template's geometry with one pdflatex run and return its calibration table
+
+    A probe document reuses the template's preamble and \\typeout's the
+    text height, line height, column widths, the width of a sample
+    sentence and the height of a section heading and of the header.
+    """
+    from latex_format import split_preamble
+    from compile_pool import _run_pdflatex
+    from pdf_cache import pdflatex_version
+
+    with open(template_path, 'r') as f:
+        preamble = split_preamble(f.read())
+    if preamble is None:
+        raise RuntimeError(f"{template_path} has no \\begin{{document}}")
+
+    with tempfile.TemporaryDirectory(prefix='resume_layout_') as work_dir:
+        tex_path = os.path.join(work_dir, 'probe.tex')
+        with open(tex_path, 'w') as f:
+            f.write(preamble + PROBE_BODY % {'sample': SAMPLE_TEXT})
+        error, output = _run_pdflatex(tex_path, work_dir, timeout)
+    if error:
+        raise RuntimeError(f"calibration compile failed: {error}")
+
+    measured = {name: float(value) for name, value in _PROBE_VALUE.findall(output)}
+    missing = {'page_height', 'line_height', 'full_width', 'sample_width', 'column_width',
+               'bullet_width', 'section', 'header'} - set(measured)
+    if missing:
+        raise RuntimeError(f"calibration probe did not report: {', '.join(sorted(missing))}")
+
+    char_width = measured['sample_width'] / len(SAMPLE_TEXT)
+    table = dict(DEFAULT_CALIBRATION)
+    table.update({
+        'source': 'measured',
+        'pdflatex': pdflatex_version(),
+        'page_height': measured['page_height'],
+        'line_height': measured['line_height'],
+        'chars_per_line': {width: int(measured[f'{width}_width'] // char_width)
+                           for width in ('full', 'column', 'bullet')},
+        'blocks': {'header': measured['header'], 'section': measured['section']},
+    })
+    return table
+
+def main():
+    parser = argparse.ArgumentParser(description='One-page layout budget for the resume template')
+    parser.add_argument('--template', default=TEMPLATE_PATH, help='LaTeX template')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('calibrate', help="Measure the template once and write <template>.layout.json")
+    plan_parser = subparsers.add_parser('plan', help='Show what would be kept on one page for a job')
+    plan_parser.add_argument('job_file', help='Job description JSON file')
+    plan_parser.add_argument('--json', action='store_true', help='Print the plan as JSON')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.template):
+        print(f"Error: Template file '{args.template}' not found")
+        sys.exit(1)
+
+    if args.command == 'calibrate':
+        try:
+            table = calibrate(args.template)
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        path = layout_path(args.template)
+        with open(path, 'w') as f:
+            json.dump(table, f, indent=2)
+            f.write('\n')
+        print(f"✅ Calibrated {args.template}: {table['chars_per_line']['column']} chars per column line, "
+              f"{table['line_height']:.1f}pt lines, {table['page_height']:.1f}pt page")
+        print(f"   Saved to {path}")
+        return
+
+    from generate_resume import load_data, tailor
+    from master_profile import MasterProfile
+
+    try:
+        master_data, job_data = load_data(MASTER_PATH, args.job_file)
+        tailored, plan = fit(tailor(MasterProfile.from_dict(master_data), job_data),
+                             Layout.load(args.template))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(plan, indent=2))
+        return
+    print(describe(plan))
+    print(f"   left column {plan['left']:.0f}pt | right column {plan['right']:.0f}pt "
+          f"({plan['source']} calibration)")
+    for section, items in plan['dropped'].items():
+        for item in items:
+            print(f"   ✂️  {section}: {item}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Master Profile
+Immutable, load-once model of master_content.json and per-job tailored views over it
+"""
+
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from content_index import MasterContentIndex
+
+def freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+def thaw(value):
+    """Inverse of freeze, for serializing a frozen structure"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [thaw(v) for v in value]
+    return value
+
+@dataclass(frozen=True)
+class Skill:
+    __slots__ = ('name',)
+    name: str
+
+@dataclass(frozen=True, eq=False)
+class Project:
+    __slots__ = ('name', 'keywords', 'data')
+    name: str
+    keywords: tuple
+    data: MappingProxyType
+
+@dataclass(frozen=True, eq=False)
+class Experience:
+    __slots__ = ('company', 'title', 'keywords', 'data')
+    company: str
+    title: str
+    keywords: tuple
+    data: MappingProxyType
+
+@dataclass(frozen=True, eq=False)
+class MasterProfile:
+    """The master resume, frozen once and shared by every tailored job
+
+    `fields` holds the full frozen master content (personal details,
+    education, languages, ...); `skills`, `projects` and `experience`
+    give typed access to the ranked sections, and `index` is the
+    MasterContentIndex built from the same data.
+    """
+    __slots__ = ('fields', 'summary', 'skills', 'projects', 'experience', 'index')
+    fields: MappingProxyType
+    summary: str
+    skills: tuple
+    projects: tuple
+    experience: tuple
+    index: MasterContentIndex
+
+    @classmethod
+    def from_dict(cls, master_data):
+        fields = freeze(master_data)
+        return cls(
+            fields=fields,
+            summary=fields.get('summary', ''),
+            skills=tuple(Skill(name) for name in fields.get('skills', ())),
+            projects=tuple(
+                Project(p.get('name', ''), p.get('keywords', ()), p)
+                for p in fields.get('projects', ())
+            ),
+            experience=tuple(
+                Experience(e.get('company', ''), e.get('title', ''), e.get('keywords', ()), e)
+                for e in fields.get('experience', ())
+            ),
+            index=MasterContentIndex(fields),
+        )
+
+    @classmethod
+    def load(cls, master_path):
+        with open(master_path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+@dataclass(frozen=True, eq=False)
+class TailoredResume:
+    """One job's selection and ordering over a shared MasterProfile
+
+    Only indices, scores and the job-specific summary suffix are stored;
+    the master text is referenced, never copied.
+    """
+    __slots__ = ('profile', 'summary_suffix', 'skill_order', 'project_order',
+                 'experience_order', 'skill_scores', 'project_scores', 'experience_scores')
+    profile: MasterProfile
+    summary_suffix: str
+    skill_order: tuple
+    project_order: tuple
+    experience_order: tuple
+    skill_scores: tuple
+    project_scores: tuple
+    experience_scores: tuple
+
+    @property
+    def summary(self):
+        return self.profile.summary + self.summary_suffix
+
+    @property
+    def skills(self):
+        return [self.profile.skills[i].name for i in self.skill_order]
+
+    @property
+    def projects(self):
+        return [self.profile.projects[i].data for i in self.project_order]
+
+    @property
+    def experience(self):
+        return [self.profile.experience[i].data for i in self.experience_order]
+
+    def section_scores(self):
+        """Relevance of the selected content per section: all skills, the kept projects, all experience"""
+        return {
+            'skills': float(sum(self.skill_scores)),
+            'projects': float(sum(self.project_scores[i] for i in self.project_order)),
+            'experience': float(sum(self.experience_scores)),
+        }
+
+    @property
+    def score(self):
+        """Overall fit of the job to the master profile (comparable within one ranking mode)"""
+        return sum(self.section_scores().values())
+
+    def context(self):
+        """Template context: the master fields with the tailored sections swapped in"""
+        context = dict(self.profile.fields)
+        context.update(summary=self.summary, skills=self.skills,
+                       projects=self.projects, experience=self.experience)
+        return context
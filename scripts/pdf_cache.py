@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+PDF Cache
+Content-addressed cache of compiled resumes, keyed on the rendered LaTeX
+"""
+
+import os
+import shutil
+import hashlib
+import argparse
+import subprocess
+import tempfile
+from functools import lru_cache
+
+DEFAULT_CACHE_DIR = 'output/.cache'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Once over its bound, the cache is pruned to this fraction of it, so the
+# directory is not rescanned on every store that follows
+PRUNE_TO = 0.9
+
+@lru_cache(maxsize=None)
+def pdflatex_version():
+    """Return the first line of `pdflatex --version`, memoized per process"""
+    try:
+        result = subprocess.run(['pdflatex', '--version'], capture_output=True, text=True)
+    except OSError:
+        return 'unavailable'
+    lines = result.stdout.splitlines()
+    return lines[0] if lines else 'unknown'
+
+@lru_cache(maxsize=32)
+def _file_digest(path, mtime_ns):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def template_digest(template_path):
+    """Hash a template file, re-reading it only when its mtime changes"""
+    if not template_path or not os.path.exists(template_path):
+        return ''
+    return _file_digest(template_path, os.stat(template_path).st_mtime_ns)
+
+class PdfCache:
+    """On-disk PDF store with size-bounded LRU eviction
+
+    Entries are named by the SHA-256 of the pdflatex version, the template
+    and the rendered LaTeX. Recency is tracked through file mtimes, which
+    are refreshed on every hit. Hits are copied out, so editing a
+    generated PDF never changes the cached one. The cache's size is
+    tracked as entries are stored and the directory is only scanned and
+    pruned when that crosses max_bytes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._size = None
+
+    def key(self, latex_content, template_path=None):
+        """Compute the cache key for a rendered resume"""
+        digest = hashlib.sha256()
+        for part in (pdflatex_version(), template_digest(template_path), latex_content):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pdf')
+
+    def fetch(self, key, output_path):
+        """Place a cached PDF at output_path; return False on a miss"""
+        cached = self.path(key)
+        try:
+            os.utime(cached)
+        except FileNotFoundError:
+            return False
+
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        if os.path.lexists(output_path):
+            os.remove(output_path)
+        try:
+            shutil.copyfile(cached, output_path)
+        except FileNotFoundError:
+            return False  # Evicted by another process since the utime
+        return True
+
+    def store(self, key, pdf_path):
+        """Copy a freshly compiled PDF into the cache, pruning it once it outgrows the size bound"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(pdf_path, tmp_path)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self.entries())
+        else:
+            self._size += os.path.getsize(self.path(key))
+        if self._size > self.max_bytes:
+            self.prune(int(self.max_bytes * PRUNE_TO))
+
+    def entries(self):
+        """Return (key, size, mtime) for every entry, least recently used first"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.pdf'):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.name[:-4], st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: e[2])
+        return entries
+
+    def prune(self, max_bytes=None):
+        """Evict least recently used entries until the cache fits; return count removed"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for key, size, _ in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def clear(self):
+        return self.prune(max_bytes=0)
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and prune the resume PDF cache')
+    parser.add_argument('command', choices=['stats', 'list', 'prune', 'clear'])
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Cache directory')
+    parser.add_argument('--max-size', type=float, help='Size bound in MB for prune')
+
+    args = parser.parse_args()
+    cache = PdfCache(args.cache_dir)
+
+    if args.command == 'stats':
+        entries = cache.entries()
+        total = sum(size for _, size, _ in entries)
+        print(f"\n🗄️  PDF Cache ({cache.cache_dir})")
+        print(f"Entries: {len(entries)}")
+        print(f"Size: {total / 1024 / 1024:.1f} MB of {cache.max_bytes / 1024 / 1024:.0f} MB")
+
+    elif args.command == 'list':
+        from datetime import datetime
+        for key, size, mtime in reversed(cache.entries()):
+            used = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+            print(f"  {key[:16]}  {size / 1024:8.1f} KB  last used {used}")
+
+    elif args.command == 'prune':
+        max_bytes = cache.max_bytes if args.max_size is None else int(args.max_size * 1024 * 1024)
+        print(f"✅ Evicted {cache.prune(max_bytes)} entries")
+
+    elif args.command == 'clear':
+        print(f"✅ Removed {cache.clear()} entries")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Resume Preview
+Render a tailored resume's selection and ordering as JSON, Markdown or HTML, without pdflatex
+"""
+
+import json
+import html
+
+PREVIEW_FORMATS = ('json', 'markdown', 'html')
+
+EXTENSIONS = {'pdf': '.pdf', 'json': '.json', 'markdown': '.md', 'html': '.html'}
+
+def _score(value):
+    return round(float(value), 4)
+
+def preview_data(tailored, job_data):
+    """The tailored sections with their relevance scores, as plain JSON-ready data"""
+    profile = tailored.profile
+    return {
+        'company': job_data.get('company', ''),
+        'title': job_data.get('title', ''),
+        'summary': tailored.summary,
+        'skills': [
+            {'name': profile.skills[i].name, 'score': _score(tailored.skill_scores[i])}
+            for i in tailored.skill_order
+        ],
+        'projects': [
+            {'name': profile.projects[i].name, 'tools': profile.projects[i].data.get('tools', ''),
+             'score': _score(tailored.project_scores[i])}
+            for i in tailored.project_order
+        ],
+        'experience': [
+            {'company': profile.experience[i].company, 'title': profile.experience[i].title,
+             'duration': profile.experience[i].data.get('duration', ''),
+             'score': _score(tailored.experience_scores[i])}
+            for i in tailored.experience_order
+        ],
+    }
+
+def render_json(data):
+    return json.dumps(data, indent=2) + '\n'
+
+def render_markdown(data):
+    lines = [f"# {data['company']} - {data['title']}", '', data['summary'], '', '## Skills', '']
+    lines += [f"{n}. {s['name']} ({s['score']:g})" for n, s in enumerate(data['skills'], 1)]
+    lines += ['', '## Projects', '']
+    lines += [f"{n}. **{p['name']}** ({p['score']:g})" + (f" - {p['tools']}" if p['tools'] else '')
+              for n, p in enumerate(data['projects'], 1)]
+    lines += ['', '## Experience', '']
+    lines += [f"{n}. **{e['company']}** - {e['title']}" + (f", {e['duration']}" if e['duration'] else '')
+              + f" ({e['score']:g})"
+              for n, e in enumerate(data['experience'], 1)]
+    return '\n'.join(lines) + '\n'
+
+def render_html(data):
+    esc = html.escape
+
+    def rows(items, columns):
+        return ''.join(
+            '<tr>' + ''.join(f'<td>{esc(str(item[c]))}</td>' for c in columns) + '</tr>\n'
+            for item in items
+        )
+
+    title = esc(f"{data['company']} - {data['title']}")
+    return (
+        '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+        f'<title>{title}</title>\n</head>\n<body>\n'
+        f'<h1>{title}</h1>\n<p>{esc(data["summary"])}</p>\n'
+        '<h2>Skills</h2>\n<table>\n<tr><th>Skill</th><th>Score</th></tr>\n'
+        f'{rows(data["skills"], ("name", "score"))}</table>\n'
+        '<h2>Projects</h2>\n<table>\n<tr><th>Project</th><th>Tools</th><th>Score</th></tr>\n'
+        f'{rows(data["projects"], ("name", "tools", "score"))}</table>\n'
+        '<h2>Experience</h2>\n<table>\n<tr><th>Company</th><th>Title</th><th>Duration</th><th>Score</th></tr>\n'
+        f'{rows(data["experience"], ("company", "title", "duration", "score"))}</table>\n'
+        '</body>\n</html>\n'
+    )
+
+RENDERERS = {'json': render_json, 'markdown': render_markdown, 'html': render_html}
+
+def render_preview(tailored, job_data, output_format):
+    """Render a TailoredResume as text in one of PREVIEW_FORMATS"""
+    return RENDERERS[output_format](preview_data(tailored, job_data))
+
+def write_preview(tailored, job_data, output_format, output_path):
+    """Render a preview straight to output_path"""
+    with open(output_path, 'w') as f:
+        f.write(render_preview(tailored, job_data, output_format))
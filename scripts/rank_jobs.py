@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Job Ranking
+Score a stream of job postings against the master profile and keep the best K
+"""
+
+import os
+import sys
+import json
+import glob
+import heapq
+import argparse
+from collections import Counter
+
+from batch_generate import iter_jobs, MASTER_PATH
+from ingest_jobs import normalize, scored
+
+DEFAULT_TOP = 10
+TOP_ITEMS = 3
+
+def breakdown(tailored):
+    """Per-section scores plus the best-matching items behind them"""
+    profile = tailored.profile
+    sections = tailored.section_scores()
+    return {
+        'skills': {'score': round(sections['skills'], 4),
+                   'top': [profile.skills[i].name for i in tailored.skill_order[:TOP_ITEMS]
+                           if tailored.skill_scores[i] > 0]},
+        'projects': {'score': round(sections['projects'], 4),
+                     'top': [profile.projects[i].name for i in tailored.project_order
+                             if tailored.project_scores[i] > 0]},
+        'experience': {'score': round(sections['experience'], 4),
+                       'top': [profile.experience[i].company for i in tailored.experience_order
+                               if tailored.experience_scores[i] > 0][:TOP_ITEMS]},
+    }
+
+def rank(jobs, profile, top=DEFAULT_TOP, engine=None, min_score=None, stats=None):
+    """Return the `top` best-fitting jobs, best first, holding at most `top` in memory
+
+    jobs yields (name, job_data, error) like batch_generate.iter_jobs.
+    A min-heap of size `top` keyed on (score, -arrival) keeps the current
+    shortlist: each new posting either replaces the weakest entry or is
+    dropped, so ties go to the posting seen first.
+    """
+    stats = Counter() if stats is None else stats
+
+    def valid():
+        for seq, (name, job_data, error) in enumerate(jobs):
+            stats['read'] += 1
+            if error is None:
+                try:
+                    yield (seq, name), normalize(job_data)
+                    continue
+                except ValueError as e:
+                    error = str(e)
+            stats['invalid'] += 1
+
+    heap = []
+    for (seq, name), job, tailored in scored(valid(), profile, engine):
+        score = tailored.score
+        if min_score is not None and score < min_score:
+            continue
+        key = (score, -seq)
+        if len(heap) < top:
+            heapq.heappush(heap, (key, name, job, tailored))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, name, job, tailored))
+
+    shortlist = []
+    for (score, _), name, job, tailored in sorted(heap, key=lambda entry: entry[0], reverse=True):
+        shortlist.append({
+            'name': name,
+            'company': job['company'],
+            'title': job['title'],
+            'location': job.get('location', ''),
+            'job_url': job.get('job_url', ''),
+            'score': round(score, 4),
+            'sections': breakdown(tailored),
+        })
+    return shortlist
+
+def print_shortlist(shortlist, stats):
+    print(f"\n🏆 Top {len(shortlist)} of {stats['read'] - stats['invalid']} postings"
+          + (f" ({stats['invalid']} invalid skipped)" if stats['invalid'] else ''))
+    print("=" * 60)
+    for n, entry in enumerate(shortlist, 1):
+        sections = entry['sections']
+        print(f"{n:2}. {entry['score']:7.2f}  {entry['company']} - {entry['title']}"
+              + (f" ({entry['location']})" if entry['location'] else ''))
+        print(f"              skills {sections['skills']['score']:.2f} | "
+              f"projects {sections['projects']['score']:.2f} | "
+              f"experience {sections['experience']['score']:.2f}")
+        for section in ('skills', 'projects', 'experience'):
+            if sections[section]['top']:
+                print(f"              {section}: {', '.join(sections[section]['top'])}")
+        if entry['job_url']:
+            print(f"              {entry['job_url']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank job postings by fit to the master profile')
+    parser.add_argument('source', help='Directory of job JSON files, glob pattern, or JSONL feed (.gz/.zst)')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Number of postings to keep')
+    parser.add_argument('--min-score', type=float, help='Ignore postings scoring below this')
+    parser.add_argument('--tfidf', action='store_true', help='Score by TF-IDF similarity instead of keyword overlap')
+    parser.add_argument('--json', action='store_true', help='Print the shortlist as JSON')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source) and not glob.has_magic(args.source):
+        print(f"Error: '{args.source}' not found")
+        sys.exit(1)
+    if args.top < 1:
+        print("Error: --top must be at least 1")
+        sys.exit(1)
+
+    from master_profile import MasterProfile
+    profile = MasterProfile.load(MASTER_PATH)
+    engine = None
+    if args.tfidf:
+        from relevance_engine import RelevanceEngine
+        engine = RelevanceEngine.load(MASTER_PATH)
+
+    stats = Counter()
+    try:
+        shortlist = rank(iter_jobs(args.source), profile, args.top, engine, args.min_score, stats)
+    except (OSError, RuntimeError, EOFError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({'read': stats['read'], 'invalid': stats['invalid'],
+                          'shortlist': shortlist}, indent=2))
+    else:
+        print_shortlist(shortlist, stats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Relevance Engine
+TF-IDF relevance of master content to job descriptions, scored in batches
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+from collections import Counter, namedtuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Bump when the analyzer or the on-disk layout changes
+CACHE_VERSION = 1
+
+SECTIONS = ('skills', 'projects', 'experience')
+
+RelevanceResult = namedtuple('RelevanceResult', ['skills', 'projects', 'experience'])
+
+def analyze(text):
+    """Lower-case and tokenize text, keeping tokens like c++ and c#"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _join(*parts):
+    words = []
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            words.extend(str(p) for p in part)
+        elif part:
+            words.append(str(part))
+    return ' '.join(words)
+
+def section_documents(master_data):
+    """Flatten each master section into one text document per item"""
+    return {
+        'skills': [skill for skill in master_data.get('skills', [])],
+        'projects': [
+            _join(p.get('name'), p.get('tools'), p.get('description'), p.get('keywords', []))
+            for p in master_data.get('projects', [])
+        ],
+        'experience': [
+            _join(e.get('title'), e.get('tech_focus'), e.get('platforms'),
+                  e.get('bullets', []), e.get('keywords', []))
+            for e in master_data.get('experience', [])
+        ],
+    }
+
+def job_document(job_data):
+    """Flatten a job description into a single text document"""
+    return _join(job_data.get('title'), job_data.get('description'),
+                 job_data.get('requirements', []), job_data.get('preferred', []),
+                 job_data.get('focus_areas', []))
+
+def cache_dir_for(master_path):
+    """Location of the fitted-model cache next to the master content file"""
+    return os.path.splitext(master_path)[0] + '.relevance'
+
+def ranked(scores):
+    """Indices of scores, highest first, ties kept in master order"""
+    return np.argsort(-np.asarray(scores), kind='stable')
+
+class RelevanceEngine:
+    """TF-IDF vector space fitted once over the master content
+
+    Fitting uses scikit-learn's TfidfVectorizer. Scoring does not need
+    scikit-learn: job descriptions are vectorized against the fitted
+    vocabulary and idf weights, stacked into one sparse matrix, and
+    multiplied against each section's item matrix, so a whole batch of
+    postings is scored with three sparse matrix products.
+    """
+
+    def __init__(self, vocabulary, idf, matrices):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.matrices = matrices
+
+    @classmethod
+    def fit(cls, master_data):
+        """Fit the vectorizer over the master content's skills, projects and experience"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        documents = section_documents(master_data)
+        vectorizer = TfidfVectorizer(analyzer=analyze)
+        vectorizer.fit([doc for section in SECTIONS for doc in documents[section]])
+
+        matrices = {section: vectorizer.transform(documents[section]).tocsr()
+                    for section in SECTIONS}
+        return cls(vectorizer.vocabulary_, vectorizer.idf_, matrices)
+
+    @classmethod
+    def load(cls, master_path, cache_dir=None):
+        """Load the fitted engine from its cache, refitting when the master file changed
+
+        The cache holds the vocabulary, idf weights and each section's CSR
+        arrays as .npy files, memory-mapped on load. It is keyed on the
+        SHA-256 of the master file plus CACHE_VERSION, so any edit to
+        master_content.json invalidates it automatically.
+        """
+        cache_dir = cache_dir or cache_dir_for(master_path)
+        with open(master_path, 'rb') as f:
+            raw = f.read()
+        master_hash = hashlib.sha256(raw).hexdigest()
+
+        engine = cls._read_cache(cache_dir, master_hash)
+        if engine is None:
+            engine = cls.fit(json.loads(raw))
+            engine.save(cache_dir, master_hash)
+        return engine
+
+    @classmethod
+    def _read_cache(cls, cache_dir, master_hash):
+        try:
+            with open(os.path.join(cache_dir, 'meta.json'), 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (meta.get('version') != CACHE_VERSION or meta.get('master_sha256') != master_hash
+                or meta.get('token_pattern') != TOKEN_PATTERN.pattern):
+            return None
+
+        from scipy.sparse import csr_matrix
+
+        def array(name):
+            return np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode='r')
+
+        try:
+            matrices = {
+                section: csr_matrix(
+                    (array(f'{section}.data'), array(f'{section}.indices'), array(f'{section}.indptr')),
+                    shape=tuple(meta['shapes'][section]), copy=False
+                )
+                for section in SECTIONS
+            }
+            idf = array('idf')
+        except (OSError, ValueError, KeyError):
+            return None
+
+        vocabulary = {term: col for col, term in enumerate(meta['terms'])}
+        return cls(vocabulary, idf, matrices)
+
+    def save(self, cache_dir, master_hash):
+        """Write the fitted state to cache_dir, replacing any previous cache; return whether it was written
+
+        The cache is written under a temporary name and swapped in with
+        two renames. If that fails, for instance because another process
+        (the render daemon, say) is publishing its own copy at the same
+        moment, the write is abandoned and the cache is left to that
+        writer; the caller keeps its freshly fitted engine either way.
+        """
+        tmp_dir = f'{cache_dir}.tmp-{os.getpid()}'
+        old_dir = f'{cache_dir}.old-{os.getpid()}'
+        try:
+            self._write_cache(tmp_dir, master_hash)
+            if os.path.exists(cache_dir):
+                os.replace(cache_dir, old_dir)
+            os.replace(tmp_dir, cache_dir)
+        except OSError:
+            return False
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        return True
+
+    def _write_cache(self, tmp_dir, master_hash):
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        terms = [None] * len(self.vocabulary)
+        for term, col in self.vocabulary.items():
+            terms[col] = term
+
+        np.save(os.path.join(tmp_dir, 'idf.npy'), np.asarray(self.idf, dtype=np.float64))
+        for section in SECTIONS:
+            matrix = self.matrices[section]
+            for part in ('data', 'indices', 'indptr'):
+                np.save(os.path.join(tmp_dir, f'{section}.{part}.npy'), getattr(matrix, part))
+
+        meta = {
+            'version': CACHE_VERSION,
+            'master_sha256': master_hash,
+            'token_pattern': TOKEN_PATTERN.pattern,
+            'shapes': {section: list(self.matrices[section].shape) for section in SECTIONS},
+            'terms': terms,
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    def transform(self, texts):
+        """Vectorize texts into an L2-normalized sparse TF-IDF matrix"""
+        from scipy.sparse import csr_matrix
+
+        data, indices, indptr = [], [], [0]
+        for text in texts:
+            counts = Counter(self.vocabulary[t] for t in analyze(text) if t in self.vocabulary)
+            row = np.array([count * self.idf[col] for col, count in counts.items()], dtype=np.float64)
+            norm = np.sqrt(row @ row) if row.size else 0.0
+            if norm:
+                row /= norm
+            indices.extend(counts)
+            data.extend(row)
+            indptr.append(len(indices))
+
+        return csr_matrix((data, indices, indptr), shape=(len(texts), len(self.idf)))
+
+    def score_jobs(self, jobs):
+        """Cosine relevance of every master item to every job
+
+        Returns one RelevanceResult per job, each holding a score array per
+        section aligned with the master content's item order.
+        """
+        job_matrix = self.transform([job_document(job) for job in jobs])
+        scores = {section: (job_matrix @ self.matrices[section].T).toarray()
+                  for section in SECTIONS}
+        return [RelevanceResult(*(scores[section][row] for section in SECTIONS))
+                for row in range(len(jobs))]
+
+    def rank_jobs(self, jobs):
+        """Ranked item indices per section for each job"""
+        return [RelevanceResult(*(ranked(section_scores) for section_scores in result))
+                for result in self.score_jobs(jobs)]
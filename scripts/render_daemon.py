@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Resume Render Daemon
+Resident asyncio service that keeps the master profile, template and pdflatex workers warm
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import http.client
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from generate_resume import tailor, render_latex, load_template, log_application
+from compile_pool import compile_latex, DEFAULT_TIMEOUT
+from batch_generate import slugify, MASTER_PATH, TEMPLATE_PATH
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY = 1024 * 1024
+MAX_JOBS = 1000
+
+# Browser origins allowed to call the API. Pages opened from file:// send
+# "null", which any sandboxed iframe can also send, so running web_app/
+# that way needs an explicit --allow-origin null
+DEFAULT_ORIGINS = ('http://localhost', 'http://127.0.0.1')
+
+LOCAL_NAMES = ('localhost', '127.0.0.1', '[::1]')
+
+STATUS_TEXT = {200: 'OK', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request',
+               403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed',
+               409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+def local_hosts(port=DEFAULT_PORT, host=DEFAULT_HOST):
+    """Host header values a request to this machine can carry; port None means a Unix socket
+
+    Anything else (a DNS-rebound name in particular) is refused.
+    """
+    names = LOCAL_NAMES if host in LOCAL_NAMES + ('0.0.0.0', '::') else LOCAL_NAMES + (host,)
+    if port is None:
+        return names
+    return tuple(f"{name}:{port}" for name in names) + (names if port == 80 else ())
+
+def _flag(value):
+    """A JSON or query-string boolean: "0", "false", "no" and "" are false"""
+    if isinstance(value, str):
+        return value.strip().lower() not in ('0', 'false', 'no', '')
+    return bool(value)
+
+class RenderJob:
+    __slots__ = ('id', 'name', 'output_path', 'status', 'error', 'created', 'elapsed', 'task')
+
+    def __init__(self, job_id, name, output_path):
+        self.id = job_id
+        self.name = name
+        self.output_path = output_path
+        self.status = 'pending'
+        self.error = None
+        self.created = time.time()
+        self.elapsed = None
+        self.task = None
+
+    def to_dict(self):
+        return {'id': self.id, 'name': self.name, 'status': self.status,
+                'output': self.output_path, 'error': self.error, 'elapsed': self.elapsed}
+
+class RenderService:
+    """Warm state shared by every render request
+
+    The MasterProfile (with its keyword index), the optional
+    RelevanceEngine and the PDF/format caches are loaded once; the master
+    file is re-read only when its mtime changes. Tailoring and rendering
+    run on the event loop (they take milliseconds); pdflatex runs on a
+    persistent thread pool so compiles overlap.
+    """
+
+    def __init__(self, master_path=MASTER_PATH, template_path=TEMPLATE_PATH,
+                 output_dir='output', workers=None, timeout=DEFAULT_TIMEOUT,
+                 cache=None, formats=None, tfidf=False):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.master_path = master_path
+        self.template_path = template_path
+        self.output_dir = output_dir
+        self.timeout = timeout
+        self.cache = cache
+        self.formats = formats
+        self.tfidf = tfidf
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                           thread_name_prefix='pdflatex')
+        self.jobs = OrderedDict()
+        self._next_id = 1
+        self._master_mtime = None
+        self.profile = None
+        self.engine = None
+        self.reload()
+
+    def reload(self):
+        """Load the master profile (and TF-IDF engine) if the master file changed"""
+        mtime = os.stat(self.master_path).st_mtime_ns
+        if mtime == self._master_mtime:
+            return
+        from master_profile import MasterProfile
+
+        self.profile = MasterProfile.load(self.master_path)
+        if self.tfidf:
+            from relevance_engine import RelevanceEngine
+            self.engine = RelevanceEngine.load(self.master_path)
+        self._master_mtime = mtime
+
+    def submit(self, job_data, output_name=None, log=False):
+        """Tailor and render job_data now and queue its compile; return the RenderJob
+
+        Without an output_name the PDF is named after the company, title,
+        date and job id, so two postings rendered the same day never share
+        a file.
+        """
+        if not isinstance(job_data, dict):
+            raise ValueError('job must be a JSON object')
+        for field in ('company', 'title'):
+            if not job_data.get(field):
+                raise ValueError(f"job is missing '{field}'")
+
+        self.reload()
+        relevance = self.engine.score_jobs([job_data])[0] if self.engine is not None else None
+        tailored = tailor(self.profile, job_data, relevance)
+        latex_content = render_latex(tailored.context(), load_template(self.template_path))
+
+        job_id = str(self._next_id)
+        name = slugify(str(output_name)) if output_name else slugify(
+            f"{job_data['company']}_{job_data['title']}_{datetime.now().strftime('%Y%m%d')}_{job_id}")
+        name = name or job_id
+        job = RenderJob(job_id, name, os.path.join(self.output_dir, f'{name}.pdf'))
+        self._next_id += 1
+
+        self.jobs[job.id] = job
+        while len(self.jobs) > MAX_JOBS:
+            self.jobs.popitem(last=False)
+
+        job.task = asyncio.ensure_future(self._compile(job, latex_content, job_data, log))
+        return job
+
+    async def _compile(self, job, latex_content, job_data, log):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            job.error = await loop.run_in_executor(
+                self.executor, compile_latex, latex_content, job.output_path, self.timeout,
+                self.cache, self.template_path, self.formats)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+        job.elapsed = round(time.perf_counter() - start, 3)
+        job.status = 'failed' if job.error else 'done'
+        if job.status == 'done' and log:
+            log_application(job_data, job.output_path)
+        print(f"{'✅' if job.status == 'done' else '❌'} {job.name} ({job.elapsed:.2f}s)")
+        return job
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+class RenderServer:
+    """Minimal HTTP/1.1 front end for a RenderService
+
+        GET  /health             service status
+        POST /render             body: a job, or {"job": {...}, "output_name", "log", "wait"}
+        GET  /jobs/<id>          job status
+        GET  /jobs/<id>/pdf      the compiled PDF
+
+    POST /render waits for the compile by default and answers with the
+    PDF (or its status as JSON when the client sends
+    Accept: application/json); with "wait": false it answers 202 with a
+    job handle to poll. One request per connection.
+
+    Requests must name this machine in their Host header and, when they
+    come from a browser (carry an Origin), an allowed origin. Browser
+    requests cannot log to the tracker unless browser_log is set.
+    """
+
+    def __init__(self, service, origins=DEFAULT_ORIGINS, hosts=None, browser_log=False):
+        self.service = service
+        self.origins = tuple(origins)
+        self.hosts = tuple(hosts) if hosts is not None else local_hosts()
+        self.browser_log = browser_log
+
+    def origin_allowed(self, origin):
+        if origin is None:
+            return True
+        return any(origin == allowed or origin.startswith(allowed + ':') for allowed in self.origins)
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, target, headers, body = await self.read_request(reader)
+            except ValueError as e:
+                await self.respond(writer, 400, {'error': str(e)})
+                return
+            except asyncio.IncompleteReadError:
+                return
+
+            host = headers.get('host', '').lower()
+            if host not in self.hosts:
+                await self.respond(writer, 403, {'error': f"host {host or '(none)'} not allowed"})
+                return
+            origin = headers.get('origin')
+            if not self.origin_allowed(origin):
+                await self.respond(writer, 403, {'error': f"origin {origin} not allowed"})
+                return
+            await self.route(writer, method, target, headers, body, origin)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.LimitOverrunError:
+            raise ValueError('request head too large')
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise ValueError('malformed request line')
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length') or 0)
+        if length > MAX_BODY:
+            raise ValueError('request body too large')
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, headers, body
+
+    async def route(self, writer, method, target, headers, body, origin):
+        url = urlsplit(target)
+        parts = [p for p in url.path.split('/') if p]
+
+        if method == 'OPTIONS':
+            await self.respond(writer, 204, None, origin=origin)
+        elif parts == ['health'] and method == 'GET':
+            await self.respond(writer, 200, {'status': 'ok', 'jobs': len(self.service.jobs),
+                                             'tfidf': self.service.engine is not None,
+                                             'formats': self.service.formats is not None},
+                               origin=origin)
+        elif parts == ['render'] and method == 'POST':
+            await self.render(writer, url, headers, body, origin)
+        elif len(parts) in (2, 3) and parts[0] == 'jobs' and method == 'GET':
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                await self.respond(writer, 404, {'error': 'unknown job'}, origin=origin)
+            elif len(parts) == 2:
+                await self.respond(writer, 200, job.to_dict(), origin=origin)
+            elif parts[2] == 'pdf':
+                await self.send_pdf(writer, job, origin)
+            else:
+                await self.respond(writer, 404, {'error': 'not found'}, origin=origin)
+        elif parts in (['health'], ['render']):
+            await self.respond(writer, 405, {'error': 'method not allowed'}, origin=origin)
+        else:
+            await self.respond(writer, 404, {'error': 'not found'}, origin=origin)
+
+    async def render(self, writer, url, headers, body, origin):
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError('body must be a JSON object')
+            job_data = request.get('job', request)
+            query = parse_qs(url.query)
+            wait = _flag(request.get('wait', query.get('wait', ['1'])[0]))
+            log = _flag(request.get('log', False)) and (origin is None or self.browser_log)
+            job = self.service.submit(job_data, request.get('output_name'), log)
+        except (ValueError, TypeError) as e:
+            await self.respond(writer, 400, {'error': str(e)}, origin=origin)
+            return
+        except Exception as e:
+            await self.respond(writer, 500, {'error': f"{type(e).__name__}: {e}"}, origin=origin)
+            return
+
+        if not wait:
+            handle = dict(job.to_dict(), url=f'/jobs/{job.id}')
+            await self.respond(writer, 202, handle, origin=origin)
+            return
+
+        await job.task
+        accept = headers.get('accept', '')
+        if 'application/json' in accept and 'application/pdf' not in accept:
+            await self.respond(writer, 200 if job.status == 'done' else 500, job.to_dict(), origin=origin)
+        else:
+            await self.send_pdf(writer, job, origin)
+
+    async def send_pdf(self, writer, job, origin):
+        if job.status == 'pending':
+            await self.respond(writer, 409, job.to_dict(), origin=origin)
+            return
+        if job.status == 'failed':
+            await self.respond(writer, 500, job.to_dict(), origin=origin)
+            return
+        try:
+            with open(job.output_path, 'rb') as f:
+                pdf = f.read()
+        except OSError as e:
+            await self.respond(writer, 500, {'error': str(e)}, origin=origin)
+            return
+        await self.respond(writer, 200, pdf, origin=origin, content_type='application/pdf',
+                           extra={'X-Resume-Path': job.output_path, 'X-Job-Id': job.id,
+                                  'Content-Disposition': f'inline; filename="{job.name}.pdf"'})
+
+    async def respond(self, writer, status, payload, origin=None,
+                      content_type='application/json', extra=None):
+        if payload is None:
+            body = b''
+        elif isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload).encode('utf-8')
+
+        headers = {'Content-Length': str(len(body)), 'Connection': 'close'}
+        if body:
+            headers['Content-Type'] = content_type
+        if origin is not None:
+            headers.update({
+                'Access-Control-Allow-Origin': origin,
+                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, Accept',
+                'Access-Control-Expose-Headers': 'X-Resume-Path, X-Job-Id',
+                'Vary': 'Origin',
+            })
+        headers.update(extra or {})
+
+        head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        head += ''.join(f"{key}: {value}\r\n" for key, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await writer.drain()
+
+async def serve(server, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+    """Listen on host:port, or on a Unix socket when socket_path is given"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        listener = await asyncio.start_unix_server(server.handle, path=socket_path)
+        where = socket_path
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+        where = f"http://{host}:{port}"
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    print(f"🖨️  Render daemon listening on {where}")
+    try:
+        async with listener:
+            await stop.wait()
+    finally:
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client connection over a Unix domain socket"""
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def render_remote(job_data, output_name=None, log=False, host=DEFAULT_HOST,
+                  port=DEFAULT_PORT, socket_path=None, timeout=DEFAULT_TIMEOUT):
+    """Ask a running daemon to render job_data; return the output path
+
+    Raises ConnectionError when no daemon is listening, so callers can
+    fall back to running generate_resume.py, and RuntimeError when the
+    daemon reports a failed render.
+    """
+    if socket_path:
+        conn = UnixHTTPConnection(socket_path, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    body = json.dumps({'job': job_data, 'output_name': output_name, 'log': log})
+    try:
+        conn.request('POST', '/render', body=body,
+                     headers={'Content-Type': 'application/json', 'Accept': 'application/json'})
+        response = conn.getresponse()
+        result = json.loads(response.read() or b'{}')
+        if not isinstance(result, dict):
+            raise ValueError('reply is not a JSON object')
+    except (OSError, ValueError, http.client.HTTPException) as e:
+        raise ConnectionError(f"render daemon unavailable: {e}") from e
+    finally:
+        conn.close()
+
+    if response.status != 200:
+        raise RuntimeError(result.get('error') or f"render failed with HTTP {response.status}")
+    return result['output']
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident resume render service')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='TCP port to listen on')
+    parser.add_argument('--socket', help='Listen on this Unix socket instead of TCP')
+    parser.add_argument('--output-dir', default='output', help='Directory for generated PDFs')
+    parser.add_argument('--workers', type=int, help='Concurrent pdflatex compiles (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Per-job pdflatex timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Always recompile, bypassing the PDF cache')
+    parser.add_argument('--fmt', action='store_true', help='Compile against a cached preamble format (needs mylatexformat)')
+    parser.add_argument('--tfidf', action='store_true', help='Rank content by TF-IDF similarity instead of keyword overlap')
+    parser.add_argument('--allow-origin', action='append',
+                        help='Extra CORS origin allowed to call the API (null for web_app/ opened from a file)')
+    parser.add_argument('--allow-browser-log', action='store_true',
+                        help='Honor "log": true from browser pages, adding tracker rows')
+
+    args = parser.parse_args()
+
+    for path in (MASTER_PATH, TEMPLATE_PATH):
+        if not os.path.exists(path):
+            print(f"Error: '{path}' not found")
+            sys.exit(1)
+
+    from pdf_cache import PdfCache
+    from latex_format import FormatCache
+
+    service = RenderService(output_dir=args.output_dir, workers=args.workers, timeout=args.timeout,
+                            cache=None if args.no_cache else PdfCache(),
+                            formats=FormatCache() if args.fmt else None, tfidf=args.tfidf)
+    server = RenderServer(service, DEFAULT_ORIGINS + tuple(args.allow_origin or ()),
+                          hosts=local_hosts(None if args.socket else args.port, args.host),
+                          browser_log=args.allow_browser_log)
+
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.socket))
+    finally:
+        service.shutdown()
+    print("\n👋 Render daemon stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tracker Stress Test
+Hammer JobTracker.add_application from many processes and verify the daily counts are exact
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import contextlib
+from multiprocessing import Pool
+
+def _worker(args):
+    db_path, worker_id, adds = args
+    from job_tracker import JobTracker
+
+    tracker = JobTracker(db_path)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(adds):
+            tracker.add_application(f'Company {worker_id}', f'Position {i}')
+    return adds
+
+def run(processes, adds, db_path, target=3):
+    """Run the stress test; return a list of failure messages (empty on success)"""
+    import tracker_db
+    from job_tracker import JobTracker
+    from datetime import datetime
+
+    tracker = JobTracker(db_path)
+    today = datetime.now().strftime('%Y-%m-%d')
+    with tracker.conn:
+        tracker.conn.execute(
+            'INSERT INTO daily_goals (date, target_applications, actual_applications) VALUES (?, ?, 0)',
+            (today, target)
+        )
+
+    # Each worker must open its own connection rather than inherit ours
+    tracker_db.close_all()
+    with Pool(processes) as pool:
+        expected = sum(pool.map(_worker, [(db_path, w, adds) for w in range(processes)]))
+
+    tracker = JobTracker(db_path)
+    rows = tracker.conn.execute('SELECT COUNT(*) FROM applications WHERE date_applied = ?', (today,)).fetchone()[0]
+    target_after, actual = tracker.conn.execute(
+        'SELECT target_applications, actual_applications FROM daily_goals WHERE date = ?', (today,)
+    ).fetchone()
+
+    failures = []
+    if rows != expected:
+        failures.append(f"applications rows: expected {expected}, found {rows}")
+    if actual != expected:
+        failures.append(f"daily_goals.actual_applications: expected {expected}, found {actual}")
+    if target_after != target:
+        failures.append(f"daily_goals.target_applications: expected {target}, found {target_after}")
+    for table, key, stored, wanted in tracker_db.check_rollups(tracker.conn):
+        failures.append(f"{table} {key}: expected {wanted}, found {stored}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-process stress test for JobTracker.add_application')
+    parser.add_argument('--processes', type=int, default=8, help='Concurrent writer processes')
+    parser.add_argument('--adds', type=int, default=200, help='Applications added per process')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='stress_tracker_') as tmp:
+        db_path = os.path.join(tmp, 'applications.db')
+        failures = run(args.processes, args.adds, db_path)
+
+    total = args.processes * args.adds
+    if failures:
+        print(f"❌ Stress test failed ({args.processes} processes x {args.adds} adds)")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"✅ {total} concurrent adds from {args.processes} processes, daily counts and rollups exact")
+
+if __name__ == "__main__":
+    main()
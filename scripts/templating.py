@@ -0,0 +1,93 @@
+"""
+Templating
+Shared Jinja2 environment for LaTeX templates under templates/
+"""
+
+import os
+import re
+from functools import lru_cache
+
+DEFAULT_TEMPLATES_DIR = 'templates'
+
+LATEX_SPECIALS = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+}
+
+_LATEX_SPECIALS_RE = re.compile('|'.join(re.escape(c) for c in LATEX_SPECIALS))
+_URL_SPECIALS_RE = re.compile(r'[%#]')
+
+class LatexSafe(str):
+    """A string that is already valid LaTeX and must not be escaped again"""
+    __slots__ = ()
+
+def latex_escape(value):
+    """Escape LaTeX special characters in a rendered value"""
+    if value is None:
+        return LatexSafe('')
+    if isinstance(value, LatexSafe):
+        return value
+    return LatexSafe(_LATEX_SPECIALS_RE.sub(lambda m: LATEX_SPECIALS[m.group()], str(value)))
+
+def latex_url(value):
+    """Prepare a URL for \\href
+
+    Accepts URLs optionally wrapped in braces, as stored in
+    master_content.json, and escapes only the characters hyperref needs.
+    """
+    url = str(value or '').strip()
+    if url.startswith('{') and url.endswith('}'):
+        url = url[1:-1]
+    return LatexSafe(_URL_SPECIALS_RE.sub(lambda m: '\\' + m.group(), url))
+
+@lru_cache(maxsize=None)
+def get_environment(templates_dir=DEFAULT_TEMPLATES_DIR):
+    """Build the LaTeX Jinja2 environment for templates_dir, once per process
+
+    Delimiters are LaTeX-shaped so they never collide with TeX braces or
+    comments:
+
+        \\VAR{expr}          output an expression (escaped automatically)
+        \\BLOCK{stmt}        a statement such as for/if/endfor
+        \\#{comment}         a template comment
+
+    Every output passes through latex_escape unless it is a LatexSafe
+    value (the `raw` and `url` filters return one). Compiled templates are
+    kept in memory by the environment and on disk in a
+    FileSystemBytecodeCache, so each template is lexed and compiled at
+    most once per process, and usually not at all on a warm start.
+    """
+    from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+    env = Environment(
+        loader=FileSystemLoader(os.path.abspath(templates_dir)),
+        bytecode_cache=FileSystemBytecodeCache(),
+        block_start_string=r'\BLOCK{',
+        block_end_string='}',
+        variable_start_string=r'\VAR{',
+        variable_end_string='}',
+        comment_start_string=r'\#{',
+        comment_end_string='}',
+        trim_blocks=True,
+        lstrip_blocks=True,
+        autoescape=False,
+        finalize=latex_escape,
+        auto_reload=True,
+    )
+    env.filters['latex'] = latex_escape
+    env.filters['raw'] = LatexSafe
+    env.filters['url'] = latex_url
+    return env
+
+def get_template(template_path):
+    """Load a template by path through the shared environment for its directory"""
+    templates_dir, name = os.path.split(template_path)
+    return get_environment(templates_dir or '.').get_template(name)
@@ -0,0 +1,635 @@
+"""
+Tracker Storage
+Shared SQLite access layer for the applications database
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+DEFAULT_DB_PATH = 'data/applications.db'
+
+APPLICATION_COLUMNS = (
+    'company', 'position', 'location', 'date_applied', 'resume_path',
+    'status', 'notes', 'job_url', 'follow_up_date', 'salary'
+)
+
+INSERT_APPLICATION = f'''
+    INSERT INTO applications ({', '.join(APPLICATION_COLUMNS)})
+    VALUES ({', '.join('?' for _ in APPLICATION_COLUMNS)})
+'''
+
+def _migration_1(conn):
+    """Base schema shared by JobTracker and generate_resume.log_application"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company TEXT NOT NULL,
+            position TEXT NOT NULL,
+            location TEXT,
+            date_applied TEXT NOT NULL,
+            resume_path TEXT,
+            status TEXT DEFAULT 'applied',
+            notes TEXT,
+            job_url TEXT,
+            follow_up_date TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_goals (
+            date TEXT PRIMARY KEY,
+            target_applications INTEGER DEFAULT 1,
+            actual_applications INTEGER DEFAULT 0
+        )
+    ''')
+
+    # Databases first created by log_application lack the tracker columns
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(applications)')}
+    for column in ('job_url', 'follow_up_date'):
+        if column not in existing:
+            conn.execute(f'ALTER TABLE applications ADD COLUMN {column} TEXT')
+
+def _migration_2(conn):
+    """Covering indexes for the tracker reports
+
+    date_applied serves the daily summary, weekly report and unfiltered
+    list; (status, date_applied) serves list --status; (status,
+    follow_up_date) serves follow-up reminders. Each index carries the
+    remaining selected columns so the reports never touch the table.
+    """
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_applications_date
+        ON applications (date_applied, company, position, status, follow_up_date)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_applications_status_date
+        ON applications (status, date_applied, company, position, follow_up_date)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_applications_status_follow_up
+        ON applications (status, follow_up_date, company, position, date_applied)
+    ''')
+
+# Searchable text columns and their bm25 weights (a company or title hit
+# outranks the same word in notes, which outranks one buried in a URL)
+FTS_COLUMNS = ('company', 'position', 'location', 'notes', 'job_url')
+FTS_WEIGHTS = (10.0, 5.0, 1.0, 2.0, 0.5)
+
+def has_fts(conn):
+    """True when the applications_fts search index exists"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'applications_fts'"
+    ).fetchone() is not None
+
+# An optional column filter followed by a quoted phrase or a bare word
+_QUERY_TERM = re.compile(r'(?:(\w+):)?("[^"]*"\*?|\S+)')
+
+def match_query(text):
+    """Translate a search box string into an FTS5 MATCH expression
+
+    Words and "quoted phrases" are all required; a trailing * makes a
+    prefix query (data* matches database); `company:acme` limits a term
+    to one column; AND, OR and NOT pass through as operators. Every term
+    is quoted, so punctuation such as c++ or e-mail addresses can never
+    become FTS5 syntax.
+    """
+    terms = []
+    for column, term in _QUERY_TERM.findall(text or ''):
+        if not column and term in ('AND', 'OR', 'NOT'):
+            terms.append(term)
+            continue
+        prefix = term.endswith('*')
+        words = term.rstrip('*').strip('"').replace('"', '""')
+        if not re.search(r'\w', words):
+            continue
+        column = f'{column}:' if column in FTS_COLUMNS else ''
+        terms.append(f'{column}"{words}"{"*" if prefix else ""}')
+    return ' '.join(terms)
+
+def _migration_3(conn):
+    """FTS5 index over the text columns, kept in sync by triggers
+
+    applications_fts is an external-content table: it stores only the
+    index and reads column text back from applications by rowid. The
+    update trigger fires only when an indexed column changes, so status
+    updates never touch the index. Without FTS5 in the linked SQLite the
+    migration is a no-op and search reports that it is unavailable.
+    """
+    columns = ', '.join(FTS_COLUMNS)
+    old_values = ', '.join(f'old.{c}' for c in FTS_COLUMNS)
+    new_values = ', '.join(f'new.{c}' for c in FTS_COLUMNS)
+    try:
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+                {columns},
+                content='applications', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        if 'fts5' not in str(e):
+            raise
+        return
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO applications_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+            INSERT INTO applications_fts (applications_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS applications_fts_update AFTER UPDATE OF {columns} ON applications BEGIN
+            INSERT INTO applications_fts (applications_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO applications_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    ''')
+    # Index the applications recorded before this migration
+    conn.execute("INSERT INTO applications_fts (applications_fts) VALUES ('rebuild')")
+
+# Funnel stages in order; an application's stage is the furthest one its
+# status has ever reached, so a rejection after interviews still counts
+# as having reached the interview stage
+FUNNEL_STAGES = ('applied', 'interview', 'offer')
+STAGE_STATUSES = {1: ('interview', 'interviewing'), 2: ('offer', 'accepted')}
+
+ROLLUP_TABLES = ('rollup_daily', 'rollup_company', 'rollup_funnel')
+
+def stage_of(status):
+    """Funnel stage index of a status (0 for applied, screening, rejected, ...)"""
+    return next((stage for stage, statuses in STAGE_STATUSES.items() if status in statuses), 0)
+
+def _stage_sql(expression):
+    """SQL CASE expression equivalent to stage_of"""
+    cases = ' '.join(
+        f"WHEN {expression} IN ({', '.join(repr(s) for s in statuses)}) THEN {stage}"
+        for stage, statuses in sorted(STAGE_STATUSES.items(), reverse=True)
+    )
+    return f'(CASE {cases} ELSE 0 END)'
+
+def _rollup_delta(table, key, key_value, status_value, delta):
+    """Trigger statements adding delta to one rollup row, dropping rows that reach zero"""
+    sql = f'''
+        INSERT INTO {table} ({key}, status, applications) VALUES ({key_value}, {status_value}, {delta})
+        ON CONFLICT ({key}, status) DO UPDATE SET applications = applications + ({delta});
+    '''
+    if delta < 0:
+        sql += f'''
+        DELETE FROM {table}
+        WHERE {key} = {key_value} AND status = {status_value} AND applications <= 0;
+    '''
+    return sql
+
+def _migration_4(conn):
+    """Rollup tables for the weekly, monthly, company and funnel reports
+
+    rollup_daily counts applications per (date applied, current status)
+    and rollup_company per (company, current status); rollup_funnel
+    counts applications per furthest funnel stage reached, which
+    applications.furthest_stage remembers across later status changes.
+    Triggers keep all three in step with every insert, update and
+    delete, whichever script writes, so reports read a handful of rollup
+    rows instead of grouping the whole table. rebuild_rollups recomputes
+    them and check_rollups compares them with the raw table.
+    """
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(applications)')}
+    if 'furthest_stage' not in existing:
+        conn.execute('ALTER TABLE applications ADD COLUMN furthest_stage INTEGER NOT NULL DEFAULT 0')
+    conn.execute(f'UPDATE applications SET furthest_stage = {_stage_sql("status")}')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_daily (
+            date TEXT NOT NULL,
+            status TEXT NOT NULL,
+            applications INTEGER NOT NULL,
+            PRIMARY KEY (date, status)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_company (
+            company TEXT NOT NULL,
+            status TEXT NOT NULL,
+            applications INTEGER NOT NULL,
+            PRIMARY KEY (company, status)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS rollup_funnel (
+            stage INTEGER PRIMARY KEY,
+            applications INTEGER NOT NULL
+        )
+    ''')
+
+    old_status, new_status = "COALESCE(old.status, '')", "COALESCE(new.status, '')"
+    new_stage = f'MAX(new.furthest_stage, {_stage_sql("new.status")})'
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS rollup_insert AFTER INSERT ON applications BEGIN
+            {_rollup_delta('rollup_daily', 'date', 'new.date_applied', new_status, 1)}
+            {_rollup_delta('rollup_company', 'company', 'new.company', new_status, 1)}
+            UPDATE applications SET furthest_stage = {new_stage}
+            WHERE id = new.id AND furthest_stage < {new_stage};
+            UPDATE rollup_funnel SET applications = applications + 1 WHERE stage <= {new_stage};
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS rollup_update AFTER UPDATE OF status, date_applied, company ON applications
+        BEGIN
+            {_rollup_delta('rollup_daily', 'date', 'old.date_applied', old_status, -1)}
+            {_rollup_delta('rollup_daily', 'date', 'new.date_applied', new_status, 1)}
+            {_rollup_delta('rollup_company', 'company', 'old.company', old_status, -1)}
+            {_rollup_delta('rollup_company', 'company', 'new.company', new_status, 1)}
+            UPDATE rollup_funnel SET applications = applications + 1
+            WHERE stage > old.furthest_stage AND stage <= {new_stage};
+            UPDATE applications SET furthest_stage = {new_stage}
+            WHERE id = new.id AND furthest_stage < {new_stage};
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS rollup_delete AFTER DELETE ON applications BEGIN
+            {_rollup_delta('rollup_daily', 'date', 'old.date_applied', old_status, -1)}
+            {_rollup_delta('rollup_company', 'company', 'old.company', old_status, -1)}
+            UPDATE rollup_funnel SET applications = applications - 1 WHERE stage <= old.furthest_stage;
+        END
+    ''')
+    rebuild_rollups(conn)
+
+def compute_rollups(conn):
+    """Recompute every rollup from the applications table in one streaming pass"""
+    daily, company, funnel = Counter(), Counter(), Counter()
+    rows = conn.execute('SELECT date_applied, company, status, furthest_stage FROM applications')
+    for date_applied, company_name, status, furthest in rows:
+        status = status or ''
+        daily[date_applied, status] += 1
+        company[company_name, status] += 1
+        for stage in range(max(furthest or 0, stage_of(status)) + 1):
+            funnel[stage] += 1
+    return {
+        'rollup_daily': {key: n for key, n in daily.items()},
+        'rollup_company': {key: n for key, n in company.items()},
+        'rollup_funnel': {(stage,): funnel[stage] for stage in range(len(FUNNEL_STAGES))},
+    }
+
+def stored_rollups(conn):
+    """The rollup tables as {table: {key tuple: applications}}"""
+    return {
+        'rollup_daily': {(d, s): n for d, s, n in conn.execute('SELECT date, status, applications FROM rollup_daily')},
+        'rollup_company': {(c, s): n for c, s, n in conn.execute('SELECT company, status, applications FROM rollup_company')},
+        'rollup_funnel': {(stage,): n for stage, n in conn.execute('SELECT stage, applications FROM rollup_funnel')},
+    }
+
+def rebuild_rollups(conn):
+    """Replace the rollup tables with a fresh recomputation; the caller owns the transaction"""
+    rollups = compute_rollups(conn)
+    for table in ROLLUP_TABLES:
+        conn.execute(f'DELETE FROM {table}')
+    conn.executemany('INSERT INTO rollup_daily (date, status, applications) VALUES (?, ?, ?)',
+                     [key + (n,) for key, n in rollups['rollup_daily'].items()])
+    conn.executemany('INSERT INTO rollup_company (company, status, applications) VALUES (?, ?, ?)',
+                     [key + (n,) for key, n in rollups['rollup_company'].items()])
+    conn.executemany('INSERT INTO rollup_funnel (stage, applications) VALUES (?, ?)',
+                     [key + (n,) for key, n in rollups['rollup_funnel'].items()])
+    return rollups
+
+def check_rollups(conn):
+    """Differences between the stored rollups and the raw table, as (table, key, stored, expected)"""
+    expected, stored = compute_rollups(conn), stored_rollups(conn)
+    mismatches = []
+    for table in ROLLUP_TABLES:
+        for key in sorted(set(expected[table]) | set(stored[table]), key=repr):
+            if stored[table].get(key, 0) != expected[table].get(key, 0):
+                mismatches.append((table, key, stored[table].get(key, 0), expected[table].get(key, 0)))
+    return mismatches
+
+# Status names get compact integer codes in status_events; these are
+# seeded, and any other status a user types is added on first use
+STATUSES = ('applied', 'screening', 'interview', 'interviewing', 'offer', 'accepted',
+            'rejected', 'withdrawn')
+APPLIED = STATUSES.index('applied') + 1
+
+# The text a status update appended to notes becomes the event's note
+_EVENT_NOTE = '''
+    CASE
+        WHEN new.notes IS old.notes OR COALESCE(new.notes, '') = '' THEN NULL
+        WHEN substr(new.notes, 1, length(COALESCE(old.notes, ''))) = COALESCE(old.notes, '')
+            THEN ltrim(substr(new.notes, length(COALESCE(old.notes, '')) + 1), char(10))
+        ELSE new.notes
+    END
+'''
+
+def _migration_5(conn):
+    """Append-only status history
+
+    Every status an application passes through is a status_events row:
+    an integer status code (see the statuses table), when it happened and
+    the note given with it. Triggers log an 'applied' event at
+    date_applied for each new application, and one event per status
+    change. Events are never updated, and only disappear with their
+    application. Existing applications are backfilled with their applied
+    event and, if they have moved on, one event for their current status
+    whose time is unknown (NULL), which the duration reports skip.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS statuses (
+            code INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    conn.executemany('INSERT OR IGNORE INTO statuses (code, name) VALUES (?, ?)',
+                     list(enumerate(STATUSES, 1)))
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS status_events (
+            id INTEGER PRIMARY KEY,
+            application_id INTEGER NOT NULL,
+            status INTEGER NOT NULL REFERENCES statuses (code),
+            at TEXT,
+            note TEXT
+        )
+    ''')
+    # Serves per-application timelines in event order without touching the table
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_status_events_application
+        ON status_events (application_id, id, status, at)
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS status_events_append_only BEFORE UPDATE ON status_events BEGIN
+            SELECT RAISE(ABORT, 'status_events is append-only');
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS status_events_insert AFTER INSERT ON applications BEGIN
+            INSERT OR IGNORE INTO statuses (name) VALUES (COALESCE(new.status, ''));
+            INSERT INTO status_events (application_id, status, at) VALUES (new.id, {APPLIED}, new.date_applied);
+            INSERT INTO status_events (application_id, status, at)
+            SELECT new.id, code, NULL FROM statuses
+            WHERE name = COALESCE(new.status, '') AND code != {APPLIED};
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS status_events_update AFTER UPDATE OF status ON applications
+        WHEN new.status IS NOT old.status
+        BEGIN
+            INSERT OR IGNORE INTO statuses (name) VALUES (COALESCE(new.status, ''));
+            INSERT INTO status_events (application_id, status, at, note)
+            SELECT new.id, code, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'), {_EVENT_NOTE}
+            FROM statuses WHERE name = COALESCE(new.status, '');
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS status_events_delete AFTER DELETE ON applications BEGIN
+            DELETE FROM status_events WHERE application_id = old.id;
+        END
+    ''')
+
+    # Backfill from the single status column
+    _log_initial_events(conn)
+
+def _log_initial_events(conn, after_id=0):
+    """Log the events status_events_insert logs, in bulk, for applications with id > after_id"""
+    conn.execute(f'''
+        INSERT INTO status_events (application_id, status, at)
+        SELECT id, {APPLIED}, date_applied FROM applications WHERE id > ? ORDER BY id
+    ''', (after_id,))
+    conn.execute('''
+        INSERT OR IGNORE INTO statuses (name)
+        SELECT DISTINCT COALESCE(status, '') FROM applications WHERE id > ?
+    ''', (after_id,))
+    conn.execute(f'''
+        INSERT INTO status_events (application_id, status, at)
+        SELECT a.id, s.code, NULL
+        FROM applications a JOIN statuses s ON s.name = COALESCE(a.status, '')
+        WHERE a.id > ? AND s.code != {APPLIED}
+        ORDER BY a.id
+    ''', (after_id,))
+
+def _migration_6(conn):
+    """Bulk import support
+
+    Adds the salary the web app records, and an index on the natural key
+    (company, position, date_applied) that import_applications probes to
+    skip rows already present. It is not UNIQUE: adding the same role
+    twice on one day by hand stays allowed.
+    """
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(applications)')}
+    if 'salary' not in existing:
+        conn.execute('ALTER TABLE applications ADD COLUMN salary TEXT')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_applications_natural_key
+        ON applications (company, position, date_applied)
+    ''')
+
+# Append-only: schema version N is reached by running MIGRATIONS[:N]
+MIGRATIONS = [_migration_1, _migration_2, _migration_3, _migration_4, _migration_5, _migration_6]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def migrate(conn):
+    """Bring the database up to SCHEMA_VERSION, one migration per transaction"""
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    while version < SCHEMA_VERSION:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have migrated while we waited for the lock
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < SCHEMA_VERSION:
+                MIGRATIONS[version](conn)
+                version += 1
+                conn.execute(f'PRAGMA user_version = {version}')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+_local = threading.local()
+
+def connect(db_path=DEFAULT_DB_PATH):
+    """Return this thread's long-lived connection to db_path
+
+    Connections are opened once per thread and database, switched to WAL
+    journal mode and migrated to the current schema on first use. Reusing
+    one connection lets sqlite3's prepared statement cache serve repeated
+    queries without re-parsing them.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    key = os.path.abspath(db_path)
+    conn = connections.get(key)
+    if conn is None:
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        migrate(conn)
+        connections[key] = conn
+    return conn
+
+def close_all():
+    """Close every connection opened by the calling thread"""
+    for conn in getattr(_local, 'connections', {}).values():
+        conn.close()
+    _local.connections = {}
+
+# A forked child must neither use nor close the parent's connections:
+# SQLite handles are not fork-safe, and closing the last handle in the
+# child could checkpoint the parent's WAL. The child starts with an empty
+# cache, and the inherited handles stay referenced so they are never
+# finalized
+_inherited = []
+
+def _reset_after_fork():
+    global _local
+    _inherited.append(_local)
+    _local = threading.local()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+@lru_cache(maxsize=4096)
+def _follow_up_date(date_applied):
+    """A week after a YYYY-MM-DD date, or None"""
+    try:
+        applied = datetime.strptime(date_applied, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return (applied + timedelta(days=7)).strftime('%Y-%m-%d')
+
+def application_row(application):
+    """Fill defaults for an application dict and return it as an INSERT row"""
+    row = {
+        'location': '',
+        'date_applied': None,
+        'resume_path': None,
+        'status': 'applied',
+        'notes': '',
+        'job_url': '',
+        'follow_up_date': None,
+        'salary': '',
+    }
+    row.update({k: v for k, v in application.items() if v is not None})
+    if row['date_applied'] is None:
+        row['date_applied'] = datetime.now().strftime('%Y-%m-%d')
+    if row['follow_up_date'] is None:
+        row['follow_up_date'] = _follow_up_date(row['date_applied'])
+    return tuple(row[column] for column in APPLICATION_COLUMNS)
+
+UPDATE_STATUS = '''
+    UPDATE applications
+    SET status = :status,
+        notes = CASE
+            WHEN COALESCE(:note, '') = '' THEN notes
+            WHEN COALESCE(notes, '') = '' THEN :note
+            ELSE notes || char(10) || :note
+        END
+    WHERE id = :id
+'''
+
+def update_statuses(conn, changes):
+    """Apply many (app_id, status, note) changes with one executemany; return applications matched
+
+    A note is appended to the application's notes rather than replacing
+    them, and is recorded on the status event the change logs. The
+    caller owns the transaction.
+    """
+    cursor = conn.executemany(UPDATE_STATUS, [{'id': app_id, 'status': status, 'note': note or ''}
+                                              for app_id, status, note in changes])
+    return cursor.rowcount
+
+def insert_applications(conn, applications):
+    """Insert many application dicts with one executemany; the caller owns the transaction"""
+    rows = [application_row(app) for app in applications]
+    conn.executemany(INSERT_APPLICATION, rows)
+    return rows
+
+_NATURAL_KEY = tuple(APPLICATION_COLUMNS.index(column) for column in ('company', 'position', 'date_applied'))
+
+def import_applications(conn, applications):
+    """Insert the application dicts not already present by (company, position, date_applied); return rows inserted
+
+    The batch's keys are probed against the natural-key index in one
+    query, and rows repeated within the batch are inserted once. The
+    caller owns the transaction.
+    """
+    import json
+
+    rows = [application_row(app) for app in applications]
+    keys = [tuple(row[i] for i in _NATURAL_KEY) for row in rows]
+    existing = set(conn.execute('''
+        SELECT a.company, a.position, a.date_applied
+        FROM json_each(?) k
+        JOIN applications a
+          ON a.company = json_extract(k.value, '$[0]')
+         AND a.position = json_extract(k.value, '$[1]')
+         AND a.date_applied = json_extract(k.value, '$[2]')
+    ''', (json.dumps(keys),)))
+
+    new_rows = []
+    for key, row in zip(keys, rows):
+        if key not in existing:
+            existing.add(key)
+            new_rows.append(row)
+    conn.executemany(INSERT_APPLICATION, new_rows)
+    return len(new_rows)
+
+# Per-row insert triggers that bulk_load replaces with set-based catch-up
+_BULK_TRIGGERS = ('applications_fts_insert', 'rollup_insert', 'status_events_insert')
+
+@contextmanager
+def bulk_load(conn):
+    """Insert many applications without the per-row insert triggers; yields the last id before the load
+
+    Must run inside the caller's transaction. The insert triggers are
+    dropped for the block; afterwards furthest_stage, the rollups, the
+    initial status events and the search index are brought up to date
+    for the new rows with one statement each, and the triggers are
+    recreated. Other connections see none of it until commit, and a
+    rollback restores the triggers along with everything else.
+    """
+    after_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM applications').fetchone()[0]
+    triggers = conn.execute(f'''
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'trigger' AND name IN ({', '.join('?' for _ in _BULK_TRIGGERS)})
+    ''', _BULK_TRIGGERS).fetchall()
+    for name, _ in triggers:
+        conn.execute(f'DROP TRIGGER {name}')
+
+    yield after_id
+
+    new = (after_id,)
+    conn.execute(f'UPDATE applications SET furthest_stage = {_stage_sql("status")} WHERE id > ?', new)
+    conn.execute('''
+        INSERT INTO rollup_daily (date, status, applications)
+        SELECT date_applied, COALESCE(status, ''), COUNT(*) FROM applications WHERE id > ? GROUP BY 1, 2
+        ON CONFLICT (date, status) DO UPDATE SET applications = applications + excluded.applications
+    ''', new)
+    conn.execute('''
+        INSERT INTO rollup_company (company, status, applications)
+        SELECT company, COALESCE(status, ''), COUNT(*) FROM applications WHERE id > ? GROUP BY 1, 2
+        ON CONFLICT (company, status) DO UPDATE SET applications = applications + excluded.applications
+    ''', new)
+    conn.execute('''
+        UPDATE rollup_funnel SET applications = applications + (
+            SELECT COUNT(*) FROM applications WHERE id > ? AND furthest_stage >= rollup_funnel.stage
+        )
+    ''', new)
+    _log_initial_events(conn, after_id)
+    if any(name == 'applications_fts_insert' for name, _ in triggers):
+        columns = ', '.join(FTS_COLUMNS)
+        conn.execute(f'''
+            INSERT INTO applications_fts (rowid, {columns})
+            SELECT id, {columns} FROM applications WHERE id > ?
+        ''', new)
+
+    for _, sql in triggers:
+        conn.execute(sql)
@@ -0,0 +1,216 @@
+"""
+Tracker Import/Export
+Stream applications between the tracker database and JSONL, JSON, CSV or a numpy columnar snapshot
+"""
+
+import csv
+import json
+import os
+import re
+from functools import lru_cache
+from itertools import islice
+
+import tracker_db
+
+CHUNK_SIZE = 5000
+
+FORMATS = ('.jsonl', '.json', '.csv', '.npz')
+
+# Web app field (web_app/app.js) -> applications column. Exports use the
+# web app's names, so an exported .json can be pasted straight into its
+# localStorage and anything exported imports back unchanged
+FIELDS = {
+    'id': 'id',
+    'company': 'company',
+    'position': 'position',
+    'location': 'location',
+    'url': 'job_url',
+    'salary': 'salary',
+    'notes': 'notes',
+    'dateApplied': 'date_applied',
+    'status': 'status',
+    'followUpDate': 'follow_up_date',
+    'resumeFile': 'resume_path',
+}
+
+DATE_FIELDS = ('dateApplied', 'followUpDate')
+
+EXPORT_SQL = f'SELECT {", ".join(FIELDS.values())} FROM applications'
+
+def _normalize(name):
+    return re.sub(r'[\s_]', '', name).lower()
+
+# Imports also accept the database column names and the headers of the
+# web app's own CSV export ("Date Applied")
+_ALIASES = {_normalize(name): column for field, column in FIELDS.items() for name in (field, column)}
+
+@lru_cache(maxsize=256)
+def _column(name):
+    return _ALIASES.get(_normalize(str(name)))
+
+def file_format(path):
+    """The format of path from its extension; ValueError if unsupported"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"unsupported file type '{ext or path}' (use {', '.join(FORMATS)})")
+    return ext
+
+def to_application(record):
+    """Map one imported record to an application dict, dropping ids, empty values and unknown fields"""
+    application = {}
+    for name, value in record.items():
+        column = _column(name)
+        if column and column != 'id' and value is not None and value != '':
+            application[column] = value if isinstance(value, str) else str(value)
+    return application
+
+def chunks(iterable, size=CHUNK_SIZE):
+    """Yield lists of up to size items"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def read_records(path):
+    """Yield the records in a .jsonl, .json (array), .csv or .npz file one at a time
+
+    Unparseable JSON raises ValueError naming the line.
+    """
+    ext = file_format(path)
+    if ext == '.npz':
+        yield from _read_npz(path)
+        return
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if ext == '.jsonl':
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"{path} line {line_no}: invalid JSON: {e.msg}") from None
+        elif ext == '.json':
+            try:
+                records = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"{path} line {e.lineno}: invalid JSON: {e.msg}") from None
+            if not isinstance(records, list):
+                raise ValueError(f"{path}: expected a JSON array of applications")
+            yield from records
+        else:
+            yield from csv.DictReader(f)
+
+def _read_npz(path):
+    import numpy as np
+
+    with np.load(path) as snapshot:
+        names = snapshot.files
+        for values in zip(*(snapshot[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+def import_file(conn, path, chunk_size=CHUNK_SIZE):
+    """Import every application in path in one transaction; return (records read, inserted, invalid)
+
+    Records go in chunk_size at a time through one executemany each,
+    under tracker_db.bulk_load so the rollups, status history and search
+    index are filled in once at the end rather than row by row. Anything
+    already in the database by (company, position, date_applied) is
+    skipped, so importing the same file twice adds nothing. Records
+    that are not objects or lack a company or position are counted as
+    invalid. Daily goal
+    counts are credited for the inserted rows only.
+    """
+    read = inserted = invalid = 0
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        with tracker_db.bulk_load(conn) as before:
+            for chunk in chunks(read_records(path), chunk_size):
+                applications = [to_application(record) for record in chunk if isinstance(record, dict)]
+                valid = [app for app in applications if app.get('company') and app.get('position')]
+                read += len(chunk)
+                invalid += len(chunk) - len(valid)
+                inserted += tracker_db.import_applications(conn, valid)
+
+        conn.execute('''
+            INSERT INTO daily_goals (date, actual_applications)
+            SELECT date_applied, COUNT(*) FROM applications WHERE id > ? GROUP BY date_applied
+            ON CONFLICT(date) DO UPDATE
+            SET actual_applications = actual_applications + excluded.actual_applications
+        ''', (before,))
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return read, inserted, invalid
+
+def export_file(conn, path, status=None, chunk_size=CHUNK_SIZE):
+    """Write applications (optionally one status) to path, oldest first; return how many
+
+    Rows are fetched chunk_size at a time and streamed out, except for
+    .npz, which holds one array per field (dates as datetime64[D]). The
+    file is written under a temporary name and renamed into place.
+    """
+    sql = EXPORT_SQL + (' WHERE status = ?' if status else '') + ' ORDER BY id'
+    cursor = conn.execute(sql, (status,) if status else ())
+    rows = (row for chunk in iter(lambda: cursor.fetchmany(chunk_size), []) for row in chunk)
+    records = ({field: '' if value is None else value for field, value in zip(FIELDS, row)}
+               for row in rows)
+
+    ext = file_format(path)
+    tmp_path = path + '.tmp'
+    try:
+        if ext == '.npz':
+            count = _write_npz(tmp_path, records)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                count = _WRITERS[ext](f, records)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+def _write_jsonl(f, records):
+    count = 0
+    for count, record in enumerate(records, 1):
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return count
+
+def _write_json(f, records):
+    count = 0
+    f.write('[')
+    for count, record in enumerate(records, 1):
+        f.write((',\n' if count > 1 else '\n') + json.dumps(record, ensure_ascii=False))
+    f.write('\n]\n')
+    return count
+
+def _write_csv(f, records):
+    writer = csv.DictWriter(f, fieldnames=list(FIELDS))
+    writer.writeheader()
+    count = 0
+    for count, record in enumerate(records, 1):
+        writer.writerow(record)
+    return count
+
+_WRITERS = {'.jsonl': _write_jsonl, '.json': _write_json, '.csv': _write_csv}
+
+def _write_npz(path, records):
+    import numpy as np
+
+    columns = {field: [] for field in FIELDS}
+    for record in records:
+        for field, value in record.items():
+            columns[field].append(value)
+
+    arrays = {'id': np.array(columns.pop('id'), dtype=np.int64)}
+    for field, values in columns.items():
+        if field in DATE_FIELDS:
+            try:
+                arrays[field] = np.array([value or 'NaT' for value in values], dtype='datetime64[D]')
+                continue
+            except ValueError:
+                pass  # A date the web app can't have written; keep the column as text
+        arrays[field] = np.array(values, dtype=str)
+
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    return len(arrays['id'])
@@ -5,6 +5,8 @@ class JobApplicationTracker {
         this.dailyGoal = 1;
         this.currentTab = 'dashboard';
         this.selectedTemplate = 'technical';
+        // Started with: python scripts/render_daemon.py
+        this.renderServiceUrl = 'http://127.0.0.1:8765';
         
         this.init();
     }
@@ -134,7 +136,7 @@ class JobApplicationTracker {
     }
 
     // Resume Generation
-    generateTailoredResume() {
+    async generateTailoredResume() {
         const company = document.getElementById('resume-company').value;
         const position = document.getElementById('resume-position').value;
         const description = document.getElementById('resume-description').value;
@@ -157,20 +159,38 @@ class JobApplicationTracker {
         // Show processing message
         this.showSuccessMessage(`Generating tailored resume for ${company} - ${position}...`);
 
-        // In a real implementation, this would call the Python backend
-        setTimeout(() => {
-            this.simulateResumeGeneration(jobData);
-        }, 2000);
-    }
+        // Render through the local resume render daemon
+        let response;
+        try {
+            response = await fetch(`${this.renderServiceUrl}/render`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/pdf' },
+                body: JSON.stringify({ job: jobData })
+            });
+        } catch (error) {
+            // Pages opened from a file send Origin "null", which the daemon only accepts when told to
+            const flags = window.location.protocol === 'file:' ? ' --allow-origin null' : '';
+            this.showErrorMessage(`Render service not reachable. Start it with: python scripts/render_daemon.py${flags}`);
+            return;
+        }
+
+        if (!response.ok) {
+            const result = await response.json().catch(() => ({}));
+            this.showErrorMessage(`Resume generation failed: ${result.error || response.status}`);
+            return;
+        }
+
+        const resumePath = response.headers.get('X-Resume-Path') || '';
+        window.open(URL.createObjectURL(await response.blob()), '_blank');
 
-    simulateResumeGeneration(jobData) {
-        // Simulate resume generation process
-        const resumeData = {
-            filename: `${jobData.company}_${new Date().getFullYear()}_${Math.random().toString(36).substr(2, 9)}.pdf`,
+        this.recordGeneratedResume(jobData, {
+            filename: resumePath.split('/').pop(),
             generatedAt: new Date().toISOString(),
             tailoredFor: `${jobData.company} - ${jobData.title}`
-        };
+        });
+    }
 
+    recordGeneratedResume(jobData, resumeData) {
         this.showSuccessMessage(`Resume generated: ${resumeData.filename}`);
         
         // Add to applications if not already exists